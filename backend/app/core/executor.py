@@ -0,0 +1,114 @@
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+from loguru import logger
+from app.core.config import settings
+from app.core.profiling import active_profile
+
+T = TypeVar("T")
+
+
+class ExecutionLayer:
+    """
+    Runs blocking work off the event loop.
+
+    I/O and model inference go to a bounded thread pool, CPU-heavy parsing to
+    a process pool. The process pool spawns fresh interpreters rather than
+    forking, since by the time it is first used the parent already runs pool
+    threads, the graph watcher and possibly torch. Each endpoint can also be capped to a fixed number of
+    in-flight requests so one slow route cannot starve the others.
+    """
+
+    def __init__(
+        self,
+        thread_workers: int,
+        process_workers: int,
+        endpoint_limits: Optional[Dict[str, int]] = None
+    ):
+        self.thread_workers = max(1, thread_workers)
+        self.process_workers = max(0, process_workers)
+        self.endpoint_limits = endpoint_limits or {}
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.thread_workers,
+                thread_name_prefix="cpo-io"
+            )
+        return self._thread_pool
+
+    @property
+    def process_pool(self) -> Executor:
+        # With no process workers configured, CPU work shares the thread pool.
+        if self.process_workers == 0:
+            return self.thread_pool
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.process_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._process_pool
+
+    @property
+    def dedicated_process_pool(self) -> Optional[ProcessPoolExecutor]:
+        """The process pool, or None when CPU work shares the thread pool."""
+        return self.process_pool if self.process_workers else None
+
+    async def run_in_thread(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking I/O or inference call on the thread pool."""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        profile = active_profile.get()
+        if profile is not None:
+            call = profile.follow(call)
+        return await loop.run_in_executor(self.thread_pool, call)
+
+    async def run_in_process(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a picklable CPU-bound call on the process pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.process_pool, functools.partial(func, *args, **kwargs)
+        )
+
+    def limit(self, endpoint: str) -> asyncio.Semaphore:
+        """
+        Get the concurrency limiter for an endpoint.
+
+        Usage: ``async with execution.limit("match"): ...``
+        """
+        semaphore = self._semaphores.get(endpoint)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(
+                self.endpoint_limits.get(endpoint, self.thread_workers)
+            )
+            self._semaphores[endpoint] = semaphore
+        return semaphore
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop both pools."""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait, cancel_futures=True)
+            self._process_pool = None
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=wait, cancel_futures=True)
+            self._thread_pool = None
+        logger.info("Execution pools shut down")
+
+
+# Global execution layer instance
+execution = ExecutionLayer(
+    thread_workers=settings.THREAD_POOL_WORKERS,
+    process_workers=settings.PROCESS_POOL_WORKERS,
+    endpoint_limits={
+        "upload": settings.UPLOAD_CONCURRENCY,
+        "job": settings.JOB_ANALYZE_CONCURRENCY,
+        "match": settings.MATCH_CONCURRENCY,
+        "ingest": settings.INGEST_CONCURRENCY
+    }
+)
@@ -0,0 +1,228 @@
+import contextvars
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Optional, Set, TypeVar
+from loguru import logger
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# Profile of the request being handled, followed into thread-pool calls
+active_profile: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "active_profile", default=None
+)
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+def _slug(value: str, limit: int = 64) -> str:
+    return _UNSAFE.sub("_", value).strip("_")[:limit] or "root"
+
+
+class RequestProfile:
+    """
+    Sampling profile of one request.
+
+    A background thread snapshots the Python stacks of the event loop thread
+    and of every pool thread currently running work for this request, and
+    counts identical stacks. Work sent to the process pool is not sampled;
+    the pool thread waiting on it shows up instead. Coroutines of concurrent
+    requests that run on the event loop between samples are included too,
+    as with any whole-thread sampler.
+    """
+
+    def __init__(self, endpoint: str, request_id: str, interval: float):
+        self.endpoint = endpoint
+        self.request_id = request_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._threads: Dict[int, str] = {threading.get_ident(): "event_loop"}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self.started = 0.0
+        self.duration = 0.0
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name="cpo-profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.duration = time.perf_counter() - self.started
+
+    def follow(self, func: Callable[[], T]) -> Callable[[], T]:
+        """Wrap a thread-pool call so the worker thread is sampled while it runs it."""
+        def call() -> T:
+            ident = threading.get_ident()
+            with self._lock:
+                self._threads[ident] = threading.current_thread().name
+            try:
+                return func()
+            finally:
+                with self._lock:
+                    self._threads.pop(ident, None)
+        return call
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = list(self._threads.items())
+            for ident, name in threads:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(name)
+                self.samples[";".join(reversed(stack))] += 1
+            self.sample_count += 1
+
+    def folded(self) -> str:
+        """Stacks in the collapsed format read by flamegraph.pl, speedscope and inferno."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def follow_all(profiles, func: Callable[[], T]) -> Callable[[], T]:
+    """Wrap a thread-pool call shared by several requests so each profile samples it."""
+    for profile in profiles:
+        func = profile.follow(func)
+    return func
+
+
+class RequestProfiler:
+    """
+    Decides which requests to profile and keeps the written profiles bounded.
+
+    A request is profiled when it carries ``X-Profile-Token`` matching
+    PROFILING_TOKEN, or when it falls in the PROFILING_SAMPLE_PERCENT sample.
+    At most ``max_concurrent`` requests are profiled at once. After each
+    write the oldest profiles are deleted until the directory is back under
+    ``max_files`` and ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        token: str = "",
+        sample_percent: float = 0.0,
+        interval_ms: float = 5.0,
+        max_concurrent: int = 2,
+        max_files: int = 200,
+        max_bytes: int = 104857600
+    ):
+        self.directory = directory
+        self.token = token
+        self.sample_percent = max(0.0, min(100.0, sample_percent))
+        self.interval = max(0.001, interval_ms / 1000)
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_files = max(1, max_files)
+        self.max_bytes = max(0, max_bytes)
+        self._active: Set[RequestProfile] = set()
+        self._lock = threading.Lock()
+        self.written = 0
+        self.pruned = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token) or self.sample_percent > 0
+
+    def wants(self, token: Optional[str]) -> bool:
+        """Whether a request with this profiling header should be profiled."""
+        if token and self.token and secrets.compare_digest(token, self.token):
+            return True
+        return self.sample_percent > 0 and random.random() * 100 < self.sample_percent
+
+    def begin(self, endpoint: str, request_id: str) -> Optional[RequestProfile]:
+        """Start sampling a request, or None when enough profiles are already running."""
+        with self._lock:
+            if len(self._active) >= self.max_concurrent:
+                return None
+            profile = RequestProfile(endpoint, request_id, self.interval)
+            self._active.add(profile)
+        profile.start()
+        return profile
+
+    def end(self, profile: RequestProfile) -> None:
+        profile.stop()
+        with self._lock:
+            self._active.discard(profile)
+
+    def write(self, profile: RequestProfile) -> Optional[str]:
+        """
+        Write a finished profile and apply the retention limits.
+
+        Args:
+            profile: Profile returned by ``begin`` and passed to ``end``
+
+        Returns:
+            Path of the profile file, or None if nothing was sampled
+        """
+        if not profile.samples:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        name = "{stamp}_{endpoint}_{request_id}_{ms}ms.folded".format(
+            stamp=time.strftime("%Y%m%dT%H%M%S"),
+            endpoint=_slug(profile.endpoint),
+            request_id=_slug(profile.request_id),
+            ms=int(profile.duration * 1000)
+        )
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(profile.folded())
+        self.written += 1
+        self._prune()
+        return path
+
+    def _prune(self) -> None:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".folded"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+        entries.sort()
+        total = sum(size for _, _, size in entries)
+        while entries and (len(entries) > self.max_files or total > self.max_bytes):
+            _, path, size = entries.pop(0)
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.error(f"Error removing old profile {path}: {e}")
+                continue
+            total -= size
+            self.pruned += 1
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "enabled": self.enabled,
+            "sample_percent": self.sample_percent,
+            "active": len(self._active),
+            "written": self.written,
+            "pruned": self.pruned
+        }
+
+
+# Global request profiler
+profiler = RequestProfiler(
+    directory=settings.PROFILING_DIR,
+    token=settings.PROFILING_TOKEN,
+    sample_percent=settings.PROFILING_SAMPLE_PERCENT,
+    interval_ms=settings.PROFILING_INTERVAL_MS,
+    max_concurrent=settings.PROFILING_MAX_CONCURRENT,
+    max_files=settings.PROFILING_MAX_FILES,
+    max_bytes=settings.PROFILING_MAX_BYTES
+)
@@ -0,0 +1,56 @@
+import struct
+
+import numpy as np
+
+# Stored vectors: 4-byte magic, dtype code, 3 pad bytes, uint32 dimension,
+# then the raw little-endian components
+HEADER = struct.Struct("<4sB3xI")
+MAGIC = b"EMB1"
+DTYPE_CODES = {"float32": 1, "float16": 2}
+CODE_DTYPES = {code: np.dtype(name).newbyteorder("<") for name, code in DTYPE_CODES.items()}
+
+
+def l2_normalize(vectors) -> np.ndarray:
+    """
+    Return float32 vectors scaled to unit length.
+
+    Works on a single vector or on a 2-D array of row vectors. Zero vectors
+    are left as zeros.
+    """
+    array = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(array, axis=-1, keepdims=True)
+    return array / np.maximum(norms, 1e-12)
+
+
+def pack_vector(vector, dtype: str = "float32") -> bytes:
+    """
+    Serialize a 1-D vector with a dtype/dimension header.
+
+    Raises:
+        ValueError: if the dtype is not supported or the vector is not 1-D
+    """
+    if dtype not in DTYPE_CODES:
+        raise ValueError(f"Unsupported vector dtype '{dtype}', expected one of {', '.join(DTYPE_CODES)}")
+    code = DTYPE_CODES[dtype]
+    array = np.asarray(vector, dtype=CODE_DTYPES[code])
+    if array.ndim != 1:
+        raise ValueError(f"Expected a 1-D vector, got shape {array.shape}")
+    return HEADER.pack(MAGIC, code, array.shape[0]) + array.tobytes()
+
+
+def unpack_vector(blob: bytes) -> np.ndarray:
+    """
+    Deserialize a vector written by ``pack_vector`` as float32.
+
+    Raises:
+        ValueError: if the blob is not a packed vector
+    """
+    if len(blob) < HEADER.size:
+        raise ValueError("Packed vector is shorter than its header")
+    magic, code, dim = HEADER.unpack_from(blob)
+    if magic != MAGIC or code not in CODE_DTYPES:
+        raise ValueError("Not a packed vector")
+    dtype = CODE_DTYPES[code]
+    if len(blob) != HEADER.size + dim * dtype.itemsize:
+        raise ValueError(f"Packed vector length does not match dimension {dim}")
+    return np.frombuffer(blob, dtype=dtype, count=dim, offset=HEADER.size).astype(np.float32)
@@ -1,38 +1,219 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends
+from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Match
+import asyncio
+import json
 import os
-import shutil
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
 from typing import Optional
 from loguru import logger
+from sqlalchemy import text
 
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import engine, Base, SessionLocal
+from app.core.executor import execution
+from app.core.metrics import (
+    HTTP_IN_FLIGHT,
+    HTTP_LATENCY,
+    HTTP_REQUESTS,
+    current_endpoint,
+    metrics,
+    stage,
+    timed_await
+)
+from app.core.profiling import active_profile, profiler
 from app.services import (
     ResumeParser,
     SkillExtractor,
     embedding_service,
+    embedding_batcher,
     SkillGapService
 )
-from app.services.knowledge_graph import get_graph
+from app.services.knowledge_graph import get_graph, graph_store
+from app.services.response_cache import CachedResponse, etag_matches, make_request_key, response_cache
+from app.services.vector_index import job_index
+from app.services.upload_store import UploadStore, UploadTooLargeError
+from app.services.resume_cache import ParsedResume, resume_cache
+from app.services.persistence import record, write_behind
+from app.services.job_ingest import IngestCheckpoint, JobIngestor, iter_lines
+from app.models.models import Resume, JobDescription, SkillGapAnalysis, LearningRoadmap
 from app.schemas.schemas import (
     JobDescriptionCreate,
     SkillGapAnalysisRequest,
     MatchScoreResponse,
     MatchCalculateRequest,
+    BatchMatchRequest,
+    JobIndexRequest,
+    TopJobsRequest,
     RoadmapGenerateRequest,
     AlternativeCareersRequest,
     CareerCounselorRequest
 )
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Upload storage
+upload_store = UploadStore(
+    settings.UPLOAD_DIR,
+    max_size=settings.MAX_UPLOAD_SIZE,
+    chunk_size=settings.UPLOAD_CHUNK_SIZE
+)
+
+async def _collect_upload_garbage_periodically():
+    """Apply the upload retention policy."""
+    while True:
+        try:
+            await execution.run_in_thread(
+                upload_store.collect_garbage,
+                settings.UPLOAD_RETENTION_HOURS * 3600,
+                settings.UPLOAD_DIR_MAX_BYTES
+            )
+        except Exception as e:
+            logger.error(f"Error collecting upload garbage: {e}")
+        await asyncio.sleep(settings.UPLOAD_GC_INTERVAL_SECONDS)
+
+async def _snapshot_job_index_periodically():
+    """Persist the job vector index whenever it has unsaved changes."""
+    while True:
+        await asyncio.sleep(settings.VECTOR_INDEX_SNAPSHOT_SECONDS)
+        try:
+            await execution.run_in_thread(job_index.snapshot)
+        except Exception as e:
+            logger.error(f"Error snapshotting job index: {e}")
+
+class _StartupPhases:
+    """Wall-clock duration of each startup phase, reported by /ready."""
+    
+    def __init__(self):
+        self.durations = {}
+    
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = round(time.perf_counter() - started, 4)
+            logger.info(f"Startup phase '{name}' took {self.durations[name]:.3f}s")
+
+async def _load_embedding_model(phases: _StartupPhases):
+    """Load (and optionally warm up) the embedding model in the background."""
+    with phases.phase("embedding_model"):
+        await execution.run_in_thread(embedding_service.load)
+    if settings.EMBEDDING_WARMUP and embedding_service.is_ready:
+        with phases.phase("embedding_warmup"):
+            await execution.run_in_thread(embedding_service.warmup)
+
+async def _create_tables() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+async def _ping_database() -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+async def _check_database(app: FastAPI) -> bool:
+    """
+    Whether the database is reachable, rechecked at most every READY_DB_CHECK_SECONDS.
+    
+    Until the tables have been created (startup may have found the database
+    down) the check retries that instead of a plain ``SELECT 1``.
+    """
+    now = time.monotonic()
+    if now - app.state.db_checked_at < settings.READY_DB_CHECK_SECONDS:
+        return app.state.db_ready
+    async with app.state.db_check_lock:
+        if now - app.state.db_checked_at < settings.READY_DB_CHECK_SECONDS:
+            return app.state.db_ready
+        probe = _ping_database if app.state.db_tables_created else _create_tables
+        try:
+            await asyncio.wait_for(probe(), settings.READY_DB_TIMEOUT_SECONDS)
+        except Exception as e:
+            app.state.db_ready = False
+            app.state.db_error = str(e) or type(e).__name__
+        else:
+            if not app.state.db_tables_created:
+                app.state.db_tables_created = True
+                if settings.PERSISTENCE_ENABLED:
+                    write_behind.start()
+            app.state.db_ready = True
+            app.state.db_error = None
+        app.state.db_checked_at = time.monotonic()
+    return app.state.db_ready
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load heavy resources at startup instead of at import time."""
+    phases = _StartupPhases()
+    app.state.startup_phases = phases.durations
+    app.state.db_ready = False
+    app.state.db_error = None
+    app.state.db_tables_created = False
+    app.state.db_checked_at = time.monotonic()
+    app.state.db_check_lock = asyncio.Lock()
+    
+    with phases.phase("database"):
+        try:
+            await _create_tables()
+            app.state.db_ready = True
+            app.state.db_tables_created = True
+        except Exception as e:
+            app.state.db_error = str(e)
+            logger.error(f"Database initialization failed: {e}")
+    if app.state.db_ready and settings.PERSISTENCE_ENABLED:
+        write_behind.start()
+    
+    with phases.phase("upload_dir"):
+        os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    
+    with phases.phase("embedding_cache"):
+        await execution.run_in_thread(embedding_service.cache.open_disk)
+    
+    if resume_cache is not None:
+        with phases.phase("resume_cache"):
+            await execution.run_in_thread(resume_cache.open)
+    
+    with phases.phase("knowledge_graph"):
+        await execution.run_in_thread(graph_store.reload)
+        graph_store.start_watching(settings.KNOWLEDGE_GRAPH_RELOAD_SECONDS)
+    
+    with phases.phase("job_index"):
+        try:
+            await execution.run_in_thread(job_index.load)
+        except Exception as e:
+            logger.error(f"Error loading job index: {e}")
+    
+    background = [
+        asyncio.create_task(_snapshot_job_index_periodically()),
+        asyncio.create_task(_collect_upload_garbage_periodically())
+    ]
+    # The server accepts traffic while the model loads; /ready reports when it is done
+    if settings.EMBEDDING_PRELOAD:
+        background.append(asyncio.create_task(_load_embedding_model(phases)))
+    
+    yield
+    
+    graph_store.stop_watching()
+    for task in background:
+        task.cancel()
+    await write_behind.close()
+    try:
+        job_index.snapshot()
+    except Exception as e:
+        logger.error(f"Error snapshotting job index: {e}")
+    embedding_service.cache.close()
+    if resume_cache is not None:
+        resume_cache.close()
+    await engine.dispose()
+    execution.shutdown(wait=False)
 
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.VERSION,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -44,8 +225,138 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create upload directory
-os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+# Allowance for multipart boundaries and headers around the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """Refuse uploads whose declared size is already over the limit."""
+    if request.url.path == "/api/resume/upload":
+        content_length = request.headers.get("content-length", "")
+        limit = settings.MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD
+        if content_length.isdigit() and int(content_length) > limit:
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"File exceeds maximum upload size of {settings.MAX_UPLOAD_SIZE} bytes"}
+            )
+    return await call_next(request)
+
+def _endpoint_template(request: Request) -> str:
+    """Route path the request matches, so metric labels stay low-cardinality."""
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Per-endpoint latency, status and in-flight counts."""
+    if not settings.METRICS_ENABLED:
+        return await call_next(request)
+    endpoint = _endpoint_template(request)
+    token = current_endpoint.set(endpoint)
+    HTTP_IN_FLIGHT.inc(endpoint=endpoint)
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_LATENCY.observe(time.perf_counter() - started, method=request.method, endpoint=endpoint)
+        HTTP_REQUESTS.inc(method=request.method, endpoint=endpoint, status=str(status))
+        HTTP_IN_FLIGHT.dec(endpoint=endpoint)
+        current_endpoint.reset(token)
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    """Run sampled or explicitly requested requests under the stack sampler."""
+    if not profiler.enabled or not profiler.wants(request.headers.get("x-profile-token")):
+        return await call_next(request)
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    profile = profiler.begin(_endpoint_template(request), request_id)
+    if profile is None:
+        return await call_next(request)
+    token = active_profile.set(profile)
+    try:
+        response = await call_next(request)
+    finally:
+        active_profile.reset(token)
+        profiler.end(profile)
+    try:
+        path = await execution.run_in_thread(profiler.write, profile)
+    except Exception as e:
+        logger.error(f"Error writing request profile: {e}")
+        path = None
+    if path:
+        logger.info(f"Profiled {profile.endpoint} ({request_id}): {profile.sample_count} samples -> {path}")
+        response.headers["X-Request-ID"] = request_id
+        response.headers["X-Profile"] = os.path.basename(path)
+    return response
+
+def _collect_service_metrics():
+    """Cache, batching and queue counters read at scrape time."""
+    cache = embedding_service.cache.stats()
+    batcher = embedding_batcher.stats()
+    queue = write_behind.stats()
+    families = [
+        ("cpo_embedding_cache_hits_total", "counter", "Embedding cache hits by tier", [
+            ("cpo_embedding_cache_hits_total", {"tier": "memory"}, cache["hits"]),
+            ("cpo_embedding_cache_hits_total", {"tier": "disk"}, cache["disk_hits"])
+        ]),
+        ("cpo_embedding_cache_misses_total", "counter", "Embedding cache misses", [
+            ("cpo_embedding_cache_misses_total", {}, cache["misses"])
+        ]),
+        ("cpo_embedding_cache_evictions_total", "counter", "Embedding cache evictions", [
+            ("cpo_embedding_cache_evictions_total", {}, cache["evictions"])
+        ]),
+        ("cpo_embedding_cache_hit_ratio", "gauge", "Embedding cache hit ratio since start", [
+            ("cpo_embedding_cache_hit_ratio", {}, cache["hit_rate"])
+        ]),
+        ("cpo_embedding_cache_bytes", "gauge", "Bytes held by the in-process embedding cache", [
+            ("cpo_embedding_cache_bytes", {}, cache["bytes"])
+        ]),
+        ("cpo_embedding_batches_total", "counter", "Micro-batches sent by the embedding batcher", [
+            ("cpo_embedding_batches_total", {}, batcher["batches"])
+        ]),
+        ("cpo_embedding_batched_texts_total", "counter", "Texts sent through the embedding batcher", [
+            ("cpo_embedding_batched_texts_total", {}, batcher["texts"])
+        ]),
+        ("cpo_write_behind_pending", "gauge", "Units waiting in the write-behind queue", [
+            ("cpo_write_behind_pending", {}, queue["pending"])
+        ]),
+        ("cpo_write_behind_records_total", "counter", "Records handled by the write-behind queue", [
+            ("cpo_write_behind_records_total", {"result": result}, queue[result])
+            for result in ("written", "failed", "dropped")
+        ]),
+        ("cpo_write_behind_retried_records_total", "counter", "Records retried after their batch failed", [
+            ("cpo_write_behind_retried_records_total", {}, queue["retried"])
+        ]),
+        ("cpo_job_index_size", "gauge", "Jobs in the vector index", [
+            ("cpo_job_index_size", {}, len(job_index))
+        ])
+    ]
+    if resume_cache is not None:
+        resume = resume_cache.stats()
+        families.append(("cpo_resume_cache_lookups_total", "counter", "Parsed-resume cache lookups", [
+            ("cpo_resume_cache_lookups_total", {"result": "hit"}, resume["hits"]),
+            ("cpo_resume_cache_lookups_total", {"result": "miss"}, resume["misses"])
+        ]))
+    if response_cache is not None:
+        responses = response_cache.stats()
+        families.append(("cpo_response_cache_lookups_total", "counter", "Recommendation response cache lookups", [
+            ("cpo_response_cache_lookups_total", {"result": "hit"}, responses["hits"]),
+            ("cpo_response_cache_lookups_total", {"result": "miss"}, responses["misses"])
+        ]))
+    return families
+
+metrics.register_collector(_collect_service_metrics)
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 @app.get("/")
 async def root():
@@ -61,6 +372,38 @@ async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness check endpoint.
+    
+    Returns 503 until the embedding model is loaded and the database is
+    reachable, with the duration of each startup phase. The database is
+    probed again once the last result is older than READY_DB_CHECK_SECONDS.
+    """
+    model_ready = embedding_service.is_ready
+    db_ready = await _check_database(app) if hasattr(app.state, "db_check_lock") else False
+    ready = model_ready and db_ready
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "ready": ready,
+            "model": {
+                "ready": model_ready,
+                "name": embedding_service.model_name,
+                "backend": embedding_service.backend_name,
+                "error": embedding_service.load_error
+            },
+            "database": {
+                "ready": db_ready,
+                "error": getattr(app.state, "db_error", None),
+                "write_behind": write_behind.stats()
+            },
+            "profiling": profiler.stats(),
+            "startup_phases": getattr(app.state, "startup_phases", {})
+        }
+    )
+
 @app.post("/api/resume/upload")
 async def upload_resume(file: UploadFile = File(...)):
     """
@@ -68,6 +411,11 @@ async def upload_resume(file: UploadFile = File(...)):
     
     Supports PDF and DOCX formats.
     """
+    async with execution.limit("upload"):
+        return await _process_resume_upload(file)
+
+async def _process_resume_upload(file: UploadFile):
+    """Validate, store, parse and embed an uploaded resume."""
     try:
         # Validate file extension
         file_ext = os.path.splitext(file.filename)[1].lower()
@@ -77,15 +425,33 @@ async def upload_resume(file: UploadFile = File(...)):
                 detail=f"Unsupported file format. Allowed: {', '.join(settings.ALLOWED_EXTENSIONS)}"
             )
         
-        # Save uploaded file
-        file_path = os.path.join(settings.UPLOAD_DIR, file.filename)
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Stream the upload to content-addressed storage
+        try:
+            with stage("store"):
+                stored = await upload_store.save(file, file_ext)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        file_path = stored.path
+        
+        logger.info(f"Resume uploaded: {file.filename} ({stored.size} bytes, sha256 {stored.sha256[:12]})")
         
-        logger.info(f"Resume uploaded: {file.filename}")
+        # Same file seen before with the current parser, taxonomy and model
+        if resume_cache is not None:
+            with stage("cache_lookup"):
+                cached = await execution.run_in_thread(resume_cache.get, stored.sha256)
+            if cached is not None:
+                logger.info(f"Resume result cache hit: {stored.sha256[:12]}")
+                await _persist_resume(file.filename, stored, cached.text, cached.skills, cached.embedding)
+                return _resume_upload_response(
+                    file.filename, stored, cached.text, cached.skills,
+                    cached.embedding is not None, cached=True
+                )
         
-        # Parse resume
-        extracted_text = ResumeParser.parse_resume(file_path, file.filename)
+        # Parse resume; page ranges fan out across the process pool
+        with stage("parse"):
+            extracted_text = await execution.run_in_thread(
+                ResumeParser.parse_resume, file_path, file.filename, execution.dedicated_process_pool
+            )
         if not extracted_text:
             raise HTTPException(
                 status_code=400,
@@ -93,29 +459,29 @@ async def upload_resume(file: UploadFile = File(...)):
             )
         
         # Clean text
-        cleaned_text = ResumeParser.clean_text(extracted_text)
+        cleaned_text = await execution.run_in_thread(ResumeParser.clean_text, extracted_text)
         
         # Extract skills
-        skills = SkillExtractor.extract_skills(cleaned_text)
-        normalized_skills = SkillExtractor.normalize_skills(skills)
+        with stage("skill_extraction"):
+            skills = await execution.run_in_thread(SkillExtractor.extract_skills, cleaned_text)
         
         # Generate embedding
-        embedding = embedding_service.generate_embedding(cleaned_text)
+        with stage("embedding"):
+            embedding = await embedding_batcher.embed_resume(cleaned_text)
+        if embedding is not None:
+            embedding = embedding_service.document_vector(embedding)
         
         logger.info(f"Extracted {len(skills)} skills from resume")
         
-        return {
-            "success": True,
-            "filename": file.filename,
-            # Return full text for downstream matching; include a short excerpt for UI if needed.
-            "extracted_text": cleaned_text,
-            "excerpt": cleaned_text[:500] + "..." if len(cleaned_text) > 500 else cleaned_text,
-            "text_length": len(cleaned_text),
-            "skills": normalized_skills,
-            "skill_count": len(normalized_skills),
-            "file_path": file_path,
-            "embedding_generated": embedding is not None
-        }
+        if resume_cache is not None and embedding is not None:
+            await execution.run_in_thread(
+                resume_cache.put, stored.sha256, ParsedResume(cleaned_text, skills, embedding)
+            )
+        await _persist_resume(file.filename, stored, cleaned_text, skills, embedding)
+        
+        return _resume_upload_response(
+            file.filename, stored, cleaned_text, skills, embedding is not None, cached=False
+        )
     
     except HTTPException:
         raise
@@ -129,12 +495,19 @@ async def analyze_job_description(job_data: JobDescriptionCreate):
     Analyze a job description and extract required skills.
     """
     try:
-        # Extract skills from job description
-        skills = SkillExtractor.extract_skills(job_data.description)
+        async with execution.limit("job"):
+            # Extract skills and generate embedding concurrently
+            skills, embedding = await asyncio.gather(
+                execution.run_in_thread(SkillExtractor.extract_skills, job_data.description),
+                embedding_batcher.embed(job_data.description)
+            )
         normalized_skills = SkillExtractor.normalize_skills(skills)
-        
-        # Generate embedding
-        embedding = embedding_service.generate_embedding(job_data.description)
+        await write_behind.submit(record(JobDescription(
+            title=job_data.title,
+            description=job_data.description,
+            skills_required=skills,
+            embedding=embedding
+        )))
         
         logger.info(f"Analyzed job: {job_data.title}, found {len(skills)} skills")
         
@@ -158,38 +531,42 @@ async def calculate_match(payload: MatchCalculateRequest):
     Returns match score, skill breakdown, and gap analysis.
     """
     try:
-        # Extract text and skills from resume
-        resume_skills = SkillExtractor.extract_skills(payload.resume_text)
-        resume_skills_normalized = SkillExtractor.normalize_skills(resume_skills)
+        async with execution.limit("match"):
+            # Skill extraction and both embeddings are independent
+            resume_skills, job_skills, resume_embedding, job_embedding = await asyncio.gather(
+                timed_await("skill_extraction_resume", execution.run_in_thread(
+                    SkillExtractor.extract_skills, payload.resume_text
+                )),
+                timed_await("skill_extraction_job", execution.run_in_thread(
+                    SkillExtractor.extract_skills, payload.job_description
+                )),
+                timed_await("embedding_resume", embedding_batcher.embed_resume(payload.resume_text)),
+                timed_await("embedding_job", embedding_batcher.embed(payload.job_description))
+            )
         
-        # Extract skills from job description
-        job_skills = SkillExtractor.extract_skills(payload.job_description)
         if not job_skills:
             role_seed = f"{payload.job_title} {payload.job_description}"
             job_skills = SkillExtractor.infer_skills_from_role(role_seed)
-        job_skills_normalized = SkillExtractor.normalize_skills(job_skills)
-        
-        # Generate embeddings
-        resume_embedding = embedding_service.generate_embedding(payload.resume_text)
-        job_embedding = embedding_service.generate_embedding(payload.job_description)
         
-        if not resume_embedding or not job_embedding:
+        if resume_embedding is None or job_embedding is None:
             raise HTTPException(
                 status_code=500,
                 detail="Failed to generate embeddings"
             )
         
         # Calculate semantic similarity
-        semantic_similarity = embedding_service.compute_similarity(
-            resume_embedding,
-            job_embedding
-        )
+        with stage("similarity"):
+            semantic_similarity = embedding_service.compute_similarity(
+                resume_embedding,
+                job_embedding
+            )
         
         # Perform skill gap analysis
-        gap_analysis = SkillGapService.analyze_skill_gap(
-            resume_skills,
-            job_skills
-        )
+        with stage("gap_analysis"):
+            gap_analysis = SkillGapService.analyze_skill_gap(
+                resume_skills,
+                job_skills
+            )
         
         # Calculate combined match score
         match_score = SkillGapService.calculate_match_score(
@@ -198,17 +575,18 @@ async def calculate_match(payload: MatchCalculateRequest):
         )
         
         # Generate heatmap data
-        heatmap_data = SkillGapService.generate_skill_heatmap_data(
-            resume_skills,
-            job_skills
-        )
-        
-        # Generate explanation
-        explanation = f"Based on semantic analysis and skill matching, your resume has a {match_score:.1f}% compatibility with the {payload.job_title} role. "
-        explanation += f"You match {gap_analysis['skills_matched']} out of {gap_analysis['total_required_skills']} required skills. "
+        with stage("heatmap"):
+            heatmap_data = SkillGapService.generate_skill_heatmap_data(
+                resume_skills,
+                job_skills
+            )
         
-        if gap_analysis['missing_skills']:
-            explanation += f"Key missing skills include: {', '.join(gap_analysis['missing_skills'][:3])}. "
+        with stage("explanation"):
+            explanation = _match_explanation(match_score, payload.job_title, gap_analysis)
+            skill_breakdown, skill_breakdown_raw = _skill_breakdowns(resume_skills, job_skills, gap_analysis)
+        await write_behind.submit(*_match_records(
+            payload.job_title, payload.job_description, job_skills, job_embedding, match_score, gap_analysis
+        ))
         
         logger.info(f"Match calculated: {match_score}% for {payload.job_title}")
         
@@ -218,20 +596,8 @@ async def calculate_match(payload: MatchCalculateRequest):
             "semantic_similarity": round(semantic_similarity * 100, 2),
             "skill_match_percentage": gap_analysis["match_percentage"],
             "job_title": payload.job_title,
-            "skill_breakdown": {
-                "resume_skills": resume_skills_normalized,
-                "required_skills": job_skills_normalized,
-                "matched_skills": [SkillExtractor.normalize_skills([s])[0] for s in gap_analysis["strong_skills"]],
-                "missing_skills": [SkillExtractor.normalize_skills([s])[0] for s in gap_analysis["missing_skills"]],
-                "additional_skills": [SkillExtractor.normalize_skills([s])[0] for s in gap_analysis["additional_skills"]]
-            },
-            "skill_breakdown_raw": {
-                "resume_skills": resume_skills,
-                "required_skills": job_skills,
-                "matched_skills": gap_analysis["strong_skills"],
-                "missing_skills": gap_analysis["missing_skills"],
-                "additional_skills": gap_analysis["additional_skills"]
-            },
+            "skill_breakdown": skill_breakdown,
+            "skill_breakdown_raw": skill_breakdown_raw,
             "heatmap_data": heatmap_data,
             "explanation": explanation
         }
@@ -242,98 +608,340 @@ async def calculate_match(payload: MatchCalculateRequest):
         logger.error(f"Error calculating match: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/roadmap/generate")
-async def generate_roadmap(payload: RoadmapGenerateRequest):
+@app.post("/api/match/batch")
+async def calculate_batch_match(payload: BatchMatchRequest):
     """
-    Generate a 6-month learning roadmap based on missing skills.
+    Rank many job descriptions against one resume.
+    
+    The resume is analyzed and embedded once, all jobs are embedded in a
+    single batch and scored with one matrix multiply.
     """
     try:
-        # Simple roadmap generation (can be enhanced with LLM)
-        roadmap = {
-            "target_role": payload.target_role,
-            "duration_months": 6,
-            "milestones": []
+        if not payload.jobs:
+            raise HTTPException(status_code=400, detail="At least one job is required")
+        
+        descriptions = [job.description for job in payload.jobs]
+        async with execution.limit("match"):
+            resume_skills, all_job_skills, resume_embedding, job_embeddings = await asyncio.gather(
+                timed_await("skill_extraction_resume", execution.run_in_thread(
+                    SkillExtractor.extract_skills, payload.resume_text
+                )),
+                timed_await("skill_extraction_jobs", execution.run_in_thread(
+                    lambda: [SkillExtractor.extract_skills(d) for d in descriptions]
+                )),
+                timed_await("embedding_resume", embedding_batcher.embed_resume(payload.resume_text)),
+                timed_await("embedding_jobs", execution.run_in_thread(
+                    embedding_service.generate_embeddings_batch, descriptions
+                ))
+            )
+        
+        if resume_embedding is None or job_embeddings is None:
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to generate embeddings"
+            )
+        
+        with stage("similarity"):
+            similarities = embedding_service.compute_similarities(resume_embedding, job_embeddings)
+        
+        # Up to BATCH_MATCH_MAX_JOBS gap analyses and heatmaps; keep them off the event loop
+        with stage("scoring"):
+            results, records = await execution.run_in_thread(
+                _score_batch, payload, resume_skills, all_job_skills, similarities, job_embeddings
+            )
+        
+        await write_behind.submit(*records)
+        results.sort(key=lambda r: r["match_score"], reverse=True)
+        if payload.top_k:
+            results = results[:payload.top_k]
+        
+        logger.info(f"Batch match calculated for {len(payload.jobs)} jobs")
+        
+        return {
+            "success": True,
+            "resume_skills": SkillExtractor.normalize_skills(resume_skills),
+            "job_count": len(payload.jobs),
+            "results": results
         }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error calculating batch match: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/jobs/index")
+async def index_job(job_data: JobIndexRequest):
+    """
+    Add or replace a job description in the vector index.
+    """
+    try:
+        async with execution.limit("job"):
+            skills, embedding = await asyncio.gather(
+                execution.run_in_thread(SkillExtractor.extract_skills, job_data.description),
+                embedding_batcher.embed(job_data.description)
+            )
+        if embedding is None:
+            raise HTTPException(status_code=500, detail="Failed to generate embedding")
         
-        graph = get_graph()
-        # Choose skills to develop
-        skills_to_develop = list(payload.missing_skills)
-        used_role_inference = False
-        if not skills_to_develop:
-            inferred = graph.get_role_skills(payload.target_role)
-            if not inferred:
-                inferred = SkillExtractor.infer_skills_from_role(payload.target_role)
-            if payload.current_skills:
-                current_set = set(graph.canonicalize_skills(payload.current_skills))
-                skills_to_develop = [s for s in inferred if s not in current_set]
-            else:
-                skills_to_develop = inferred
-            used_role_inference = True
-
-        if not skills_to_develop:
-            skills_to_develop = [
-                "System Design",
-                "Project Building",
-                "Testing",
-                "Cloud Fundamentals",
-                "Interview Preparation",
-                "Portfolio"
-            ]
-
-        canonical_skills = graph.canonicalize_skills(skills_to_develop)
-        if used_role_inference:
-            skills_to_develop = SkillExtractor.normalize_skills(canonical_skills)
-        else:
-            skills_to_develop = SkillExtractor.normalize_skills(canonical_skills)
-
-        # Order skills using prereqs and distribute across 6 months
-        ordered = graph.order_skills_with_prereqs(canonical_skills)
-        ordered_display = SkillExtractor.normalize_skills(ordered)
-        skills_per_month = max(1, len(ordered_display) // 6)
-        
-        for month in range(1, 7):
-            start_idx = (month - 1) * skills_per_month
-            end_idx = start_idx + skills_per_month if month < 6 else len(ordered_display)
-            
-            month_skills = ordered_display[start_idx:end_idx]
-            
-            if month_skills:
-                roadmap["milestones"].append({
-                    "month": month,
-                    "title": f"Month {month}: {', '.join(month_skills[:2])}",
-                    "skills": month_skills,
-                    "focus_areas": month_skills,
-                    "estimated_hours": len(month_skills) * 20
-                })
-        
-        # Course recommendations
-        recommendations = graph.recommend_courses(ordered, limit=5)
-        if not recommendations:
-            for skill in ordered_display[:5]:
-                recommendations.append({
-                    "skill": skill,
-                    "platform": "Coursera / NPTEL",
-                    "course_name": f"{skill} Fundamentals",
-                    "duration": "4-6 weeks",
-                    "roi_score": 85,
-                    "relevance": "High"
-                })
+        await execution.run_in_thread(
+            job_index.add,
+            [job_data.job_id],
+            [embedding],
+            [{"title": job_data.title, "skills": skills}]
+        )
         
-        logger.info(f"Generated roadmap for {payload.target_role}")
+        logger.info(f"Indexed job {job_data.job_id}: {job_data.title}")
+        
+        return {
+            "success": True,
+            "job_id": job_data.job_id,
+            "skills_required": SkillExtractor.normalize_skills(skills),
+            "indexed_jobs": len(job_index)
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error indexing job: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/jobs/ingest")
+async def ingest_jobs(
+    request: Request,
+    checkpoint: Optional[str] = None,
+    index: bool = True
+):
+    """
+    Bulk-ingest job descriptions streamed as NDJSON.
+    
+    Each line holds ``title``, ``description`` and optionally ``job_id``.
+    With a ``checkpoint`` name, re-sending the same feed after an
+    interruption skips the lines that were already committed.
+    """
+    try:
+        async with execution.limit("ingest"):
+            ingestor = JobIngestor(
+                session_factory=SessionLocal if getattr(app.state, "db_ready", False) else None,
+                index=job_index if index else None,
+                chunk_size=settings.INGEST_CHUNK_SIZE,
+                checkpoint=(
+                    IngestCheckpoint.for_name(settings.INGEST_CHECKPOINT_DIR, checkpoint)
+                    if checkpoint else None
+                ),
+                snapshot_every=settings.INGEST_SNAPSHOT_CHUNKS
+            )
+            stats = await ingestor.run(iter_lines(request.stream()))
+        
+        logger.info(f"Bulk ingestion finished: {stats.ingested} jobs in {stats.elapsed_seconds:.1f}s")
         
         return {
             "success": True,
-            "roadmap": roadmap,
-            "recommendations": recommendations,
-            "skills_to_develop": ordered_display
+            **stats.as_dict(),
+            "indexed_jobs": len(job_index)
         }
     
+    except Exception as e:
+        logger.error(f"Error ingesting jobs: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.delete("/api/jobs/index/{job_id}")
+async def remove_indexed_job(job_id: int):
+    """
+    Remove a job description from the vector index.
+    """
+    removed = await execution.run_in_thread(job_index.delete, [job_id])
+    if not removed:
+        raise HTTPException(status_code=404, detail="Job not found in index")
+    return {"success": True, "job_id": job_id, "indexed_jobs": len(job_index)}
+
+@app.post("/api/match/top-jobs")
+async def top_matching_jobs(payload: TopJobsRequest):
+    """
+    Return the indexed jobs most semantically similar to a resume.
+    """
+    try:
+        async with execution.limit("match"):
+            resume_skills, resume_embedding = await asyncio.gather(
+                execution.run_in_thread(SkillExtractor.extract_skills, payload.resume_text),
+                embedding_batcher.embed_resume(payload.resume_text)
+            )
+            if resume_embedding is None:
+                raise HTTPException(status_code=500, detail="Failed to generate embeddings")
+            hits = await execution.run_in_thread(
+                job_index.search, embedding_service.document_vector(resume_embedding), payload.top_k
+            )
+        
+        resume_set = set(resume_skills)
+        results = []
+        for hit in hits:
+            job_skills = hit.get("skills", [])
+            matched = [s for s in job_skills if s in resume_set]
+            results.append({
+                "job_id": hit["job_id"],
+                "title": hit.get("title"),
+                "semantic_similarity": round(hit["score"] * 100, 2),
+                "matched_skills": SkillExtractor.normalize_skills(matched),
+                "skills_required": SkillExtractor.normalize_skills(job_skills)
+            })
+        
+        return {
+            "success": True,
+            "indexed_jobs": len(job_index),
+            "results": results
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching job index: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _cached_response(entry: CachedResponse, if_none_match: Optional[str]) -> Response:
+    """Serve a cached body, or 304 when the client already holds this version."""
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+def _build_roadmap(graph, payload: RoadmapGenerateRequest) -> dict:
+    """Roadmap, course recommendations and ordered skills for a request."""
+    # Simple roadmap generation (can be enhanced with LLM)
+    roadmap = {
+        "target_role": payload.target_role,
+        "duration_months": 6,
+        "milestones": []
+    }
+    
+    # Choose skills to develop
+    current_set = set(graph.canonicalize_skills(payload.current_skills or []))
+    skills_to_develop = list(payload.missing_skills)
+    if not skills_to_develop:
+        inferred = graph.get_role_skills(payload.target_role)
+        if not inferred:
+            inferred = SkillExtractor.infer_skills_from_role(payload.target_role)
+        if payload.current_skills:
+            skills_to_develop = [s for s in inferred if s not in current_set]
+        else:
+            skills_to_develop = inferred
+
+    if not skills_to_develop:
+        skills_to_develop = [
+            "System Design",
+            "Project Building",
+            "Testing",
+            "Cloud Fundamentals",
+            "Interview Preparation",
+            "Portfolio"
+        ]
+
+    canonical_skills = graph.canonicalize_skills(skills_to_develop)
+
+    # Order skills using prereqs and distribute across 6 months
+    ordered = graph.order_skills_with_prereqs(
+        canonical_skills,
+        expand=bool(payload.expand_prerequisites),
+        known=current_set
+    )
+    ordered_display = SkillExtractor.normalize_skills(ordered)
+    skills_per_month = max(1, len(ordered_display) // 6)
+    
+    for month in range(1, 7):
+        start_idx = (month - 1) * skills_per_month
+        end_idx = start_idx + skills_per_month if month < 6 else len(ordered_display)
+        
+        month_skills = ordered_display[start_idx:end_idx]
+        
+        if month_skills:
+            roadmap["milestones"].append({
+                "month": month,
+                "title": f"Month {month}: {', '.join(month_skills[:2])}",
+                "skills": month_skills,
+                "focus_areas": month_skills,
+                "estimated_hours": len(month_skills) * 20
+            })
+    
+    # Course recommendations
+    recommendations = graph.recommend_courses(ordered, limit=5)
+    if not recommendations:
+        for skill in ordered_display[:5]:
+            recommendations.append({
+                "skill": skill,
+                "platform": "Coursera / NPTEL",
+                "course_name": f"{skill} Fundamentals",
+                "duration": "4-6 weeks",
+                "roi_score": 85,
+                "relevance": "High"
+            })
+    
+    return {
+        "success": True,
+        "roadmap": roadmap,
+        "recommendations": recommendations,
+        "skills_to_develop": ordered_display
+    }
+
+@app.post("/api/roadmap/generate")
+async def generate_roadmap(payload: RoadmapGenerateRequest, if_none_match: Optional[str] = Header(None)):
+    """
+    Generate a 6-month learning roadmap based on missing skills.
+    """
+    try:
+        graph = get_graph()
+        if response_cache is None:
+            result = _build_roadmap(graph, payload)
+        else:
+            # Current skills only matter when the roadmap is inferred from
+            # the role or prerequisites are being added
+            expand = bool(payload.expand_prerequisites)
+            key = make_request_key("roadmap", graph.version, {
+                "missing_skills": graph.canonicalize_skills(payload.missing_skills),
+                "current_skills": (
+                    None if payload.missing_skills and not expand
+                    else graph.canonicalize_skills(payload.current_skills or [])
+                ),
+                "target_role": payload.target_role,
+                "expand_prerequisites": expand
+            })
+            entry = response_cache.get(key)
+            if entry is None:
+                entry = response_cache.put(key, _build_roadmap(graph, payload))
+            result = json.loads(entry.body)
+        
+        await write_behind.submit(record(LearningRoadmap(
+            roadmap_data=result["roadmap"],
+            recommendations=result["recommendations"]
+        )))
+        
+        logger.info(f"Generated roadmap for {payload.target_role}")
+        
+        if response_cache is None:
+            return result
+        return _cached_response(entry, if_none_match)
+    
     except Exception as e:
         logger.error(f"Error generating roadmap: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _build_alternatives(graph, canonical: list, current_role: Optional[str], top_k: int) -> dict:
+    alternatives = graph.suggest_alternative_roles(
+        canonical,
+        current_role=current_role,
+        top_k=top_k
+    )
+    if not alternatives:
+        alternatives = SkillExtractor.suggest_alternative_roles(
+            canonical,
+            exclude_role=current_role,
+            top_k=top_k
+        )
+    return {
+        "success": True,
+        "alternatives": alternatives
+    }
+
 @app.post("/api/career/alternatives")
-async def alternative_careers(payload: AlternativeCareersRequest):
+async def alternative_careers(payload: AlternativeCareersRequest, if_none_match: Optional[str] = Header(None)):
     """
     Suggest alternative careers based on current skills.
     """
@@ -342,29 +950,38 @@ async def alternative_careers(payload: AlternativeCareersRequest):
             raise HTTPException(status_code=400, detail="Skills are required")
         graph = get_graph()
         canonical = graph.canonicalize_skills(payload.skills)
-        alternatives = graph.suggest_alternative_roles(
-            canonical,
-            current_role=payload.current_role,
-            top_k=payload.top_k or 5
-        )
-        if not alternatives:
-            alternatives = SkillExtractor.suggest_alternative_roles(
-                canonical,
-                exclude_role=payload.current_role,
-                top_k=payload.top_k or 5
-            )
-        return {
-            "success": True,
-            "alternatives": alternatives
-        }
+        top_k = payload.top_k or 5
+        if response_cache is None:
+            return _build_alternatives(graph, canonical, payload.current_role, top_k)
+        # The catalog fallback matches the lower-cased role as a substring,
+        # so only case is folded here
+        key = make_request_key("alternatives", graph.version, {
+            "skills": canonical,
+            "current_role": payload.current_role.lower() if payload.current_role else None,
+            "top_k": top_k
+        })
+        entry = response_cache.get(key)
+        if entry is None:
+            entry = response_cache.put(key, _build_alternatives(graph, canonical, payload.current_role, top_k))
+        return _cached_response(entry, if_none_match)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error suggesting alternatives: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _build_certifications(graph, canonical: list, target_role: Optional[str], top_k: int) -> dict:
+    return {
+        "success": True,
+        "certifications": graph.recommend_certifications(
+            canonical,
+            target_role=target_role,
+            limit=top_k
+        )
+    }
+
 @app.post("/api/career/counselor")
-async def career_counselor(payload: CareerCounselorRequest):
+async def career_counselor(payload: CareerCounselorRequest, if_none_match: Optional[str] = Header(None)):
     """
     Provide tailored certification recommendations with high ROI.
     """
@@ -373,21 +990,156 @@ async def career_counselor(payload: CareerCounselorRequest):
             raise HTTPException(status_code=400, detail="Skills are required")
         graph = get_graph()
         canonical = graph.canonicalize_skills(payload.skills)
-        certs = graph.recommend_certifications(
-            canonical,
-            target_role=payload.target_role,
-            limit=payload.top_k or 5
-        )
-        return {
-            "success": True,
-            "certifications": certs
-        }
+        top_k = payload.top_k or 5
+        if response_cache is None:
+            return _build_certifications(graph, canonical, payload.target_role, top_k)
+        # Only the graph role the target resolves to affects the ranking
+        key = make_request_key("counselor", graph.version, {
+            "skills": canonical,
+            "target_role": graph.find_role_key(payload.target_role or ""),
+            "top_k": top_k
+        })
+        entry = response_cache.get(key)
+        if entry is None:
+            entry = response_cache.put(key, _build_certifications(graph, canonical, payload.target_role, top_k))
+        return _cached_response(entry, if_none_match)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error generating counseling: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _resume_upload_response(
+    filename: str,
+    stored,
+    cleaned_text: str,
+    skills: list,
+    embedding_generated: bool,
+    cached: bool
+) -> dict:
+    """Response body for a processed resume upload."""
+    normalized_skills = SkillExtractor.normalize_skills(skills)
+    return {
+        "success": True,
+        "filename": filename,
+        # Return full text for downstream matching; include a short excerpt for UI if needed.
+        "extracted_text": cleaned_text,
+        "excerpt": cleaned_text[:500] + "..." if len(cleaned_text) > 500 else cleaned_text,
+        "text_length": len(cleaned_text),
+        "skills": normalized_skills,
+        "skill_count": len(normalized_skills),
+        "file_path": stored.path,
+        "file_hash": stored.sha256,
+        "deduplicated": stored.deduplicated,
+        "cached": cached,
+        "embedding_generated": embedding_generated
+    }
+
+async def _persist_resume(filename: str, stored, cleaned_text: str, skills: list, embedding) -> None:
+    await write_behind.submit(record(Resume(
+        filename=filename,
+        file_path=stored.path,
+        extracted_text=cleaned_text,
+        skills=skills,
+        embedding=embedding
+    )))
+
+def _match_records(
+    job_title: str,
+    job_description: str,
+    job_skills: list,
+    job_embedding,
+    match_score: float,
+    gap_analysis: dict
+) -> list:
+    """A job description and its gap analysis, linked once the job is inserted."""
+    job = record(JobDescription(
+        title=job_title,
+        description=job_description,
+        skills_required=job_skills,
+        embedding=job_embedding
+    ))
+    analysis = record(
+        SkillGapAnalysis(
+            match_score=match_score,
+            missing_skills=gap_analysis["missing_skills"],
+            weak_skills=gap_analysis["weak_skills"],
+            strong_skills=gap_analysis["strong_skills"]
+        ),
+        job_description_id=job
+    )
+    return [job, analysis]
+
+def _score_batch(
+    payload: BatchMatchRequest,
+    resume_skills: list,
+    all_job_skills: list,
+    similarities,
+    job_embeddings
+) -> tuple:
+    """Per-job results and persistence records for a batch match, in request order."""
+    results = []
+    records = []
+    for idx, job in enumerate(payload.jobs):
+        job_skills = all_job_skills[idx]
+        if not job_skills:
+            job_skills = SkillExtractor.infer_skills_from_role(f"{job.title} {job.description}")
+        
+        gap_analysis = SkillGapService.analyze_skill_gap(resume_skills, job_skills)
+        match_score = SkillGapService.calculate_match_score(
+            similarities[idx],
+            gap_analysis["match_percentage"]
+        )
+        
+        result = {
+            "index": idx,
+            "job_id": job.job_id,
+            "job_title": job.title,
+            "match_score": match_score,
+            "semantic_similarity": round(similarities[idx] * 100, 2),
+            "skill_match_percentage": gap_analysis["match_percentage"],
+            "skills_matched": gap_analysis["skills_matched"],
+            "total_required_skills": gap_analysis["total_required_skills"]
+        }
+        records.extend(_match_records(
+            job.title, job.description, job_skills, job_embeddings[idx], match_score, gap_analysis
+        ))
+        if payload.include_breakdown:
+            result["skill_breakdown"], result["skill_breakdown_raw"] = _skill_breakdowns(
+                resume_skills, job_skills, gap_analysis
+            )
+            result["heatmap_data"] = SkillGapService.generate_skill_heatmap_data(resume_skills, job_skills)
+            result["explanation"] = _match_explanation(match_score, job.title, gap_analysis)
+        results.append(result)
+    return results, records
+
+def _match_explanation(match_score: float, job_title: str, gap_analysis: dict) -> str:
+    """Human-readable summary of a match result."""
+    explanation = f"Based on semantic analysis and skill matching, your resume has a {match_score:.1f}% compatibility with the {job_title} role. "
+    explanation += f"You match {gap_analysis['skills_matched']} out of {gap_analysis['total_required_skills']} required skills. "
+    
+    if gap_analysis['missing_skills']:
+        explanation += f"Key missing skills include: {', '.join(gap_analysis['missing_skills'][:3])}. "
+    return explanation
+
+def _skill_breakdowns(resume_skills: list, job_skills: list, gap_analysis: dict) -> tuple:
+    """Display-name and canonical skill breakdowns for a match result."""
+    display = {
+        "resume_skills": SkillExtractor.normalize_skills(resume_skills),
+        "required_skills": SkillExtractor.normalize_skills(job_skills),
+        "matched_skills": SkillExtractor.normalize_skills(gap_analysis["strong_skills"]),
+        "missing_skills": SkillExtractor.normalize_skills(gap_analysis["missing_skills"]),
+        "additional_skills": SkillExtractor.normalize_skills(gap_analysis["additional_skills"])
+    }
+    raw = {
+        "resume_skills": resume_skills,
+        "required_skills": job_skills,
+        "matched_skills": gap_analysis["strong_skills"],
+        "missing_skills": gap_analysis["missing_skills"],
+        "additional_skills": gap_analysis["additional_skills"]
+    }
+    return display, raw
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=settings.DEBUG)
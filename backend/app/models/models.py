@@ -1,6 +1,28 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON, LargeBinary
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
+from app.core.config import settings
 from app.core.database import Base
+from app.core.vectors import pack_vector, unpack_vector
+
+class PackedVector(TypeDecorator):
+    """Embedding stored as raw bytes with a dtype/dimension header, loaded as a float32 ndarray."""
+    impl = LargeBinary
+    cache_ok = True
+    
+    def __init__(self, dtype: str = "float32"):
+        super().__init__()
+        self.dtype = dtype
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return pack_vector(value, self.dtype)
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return unpack_vector(value)
 
 class User(Base):
     """User model."""
@@ -23,7 +45,7 @@ class Resume(Base):
     file_path = Column(String, nullable=False)
     extracted_text = Column(Text)
     skills = Column(JSON)  # List of extracted skills
-    embedding = Column(JSON)  # Vector embedding
+    embedding = Column(PackedVector(settings.EMBEDDING_STORAGE_DTYPE))  # Unit-length vector embedding
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class JobDescription(Base):
@@ -34,7 +56,7 @@ class JobDescription(Base):
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
     skills_required = Column(JSON)  # List of required skills
-    embedding = Column(JSON)  # Vector embedding
+    embedding = Column(PackedVector(settings.EMBEDDING_STORAGE_DTYPE))  # Unit-length vector embedding
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class SkillGapAnalysis(Base):
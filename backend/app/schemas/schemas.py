@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+from app.core.config import settings
 
 # User schemas
 class UserBase(BaseModel):
@@ -87,10 +88,31 @@ class MatchCalculateRequest(BaseModel):
     job_description: str
     job_title: Optional[str] = "Target Role"
 
+class BatchMatchJob(BaseModel):
+    description: str
+    title: Optional[str] = "Target Role"
+    job_id: Optional[int] = None
+
+class BatchMatchRequest(BaseModel):
+    resume_text: str
+    jobs: List[BatchMatchJob] = Field(..., max_length=settings.BATCH_MATCH_MAX_JOBS)
+    include_breakdown: bool = False
+    top_k: Optional[int] = Field(None, ge=1)
+
+class JobIndexRequest(BaseModel):
+    job_id: int
+    title: str
+    description: str
+
+class TopJobsRequest(BaseModel):
+    resume_text: str
+    top_k: int = Field(10, ge=1, le=settings.VECTOR_INDEX_MAX_TOP_K)
+
 class RoadmapGenerateRequest(BaseModel):
     missing_skills: List[str]
     target_role: Optional[str] = "Your Target Role"
     current_skills: Optional[List[str]] = None
+    expand_prerequisites: Optional[bool] = False  # add missing transitive prerequisites
 
 class AlternativeCareersRequest(BaseModel):
     skills: List[str]
@@ -1,7 +1,7 @@
 """Services package initialization."""
 from app.services.resume_parser import ResumeParser
 from app.services.skill_extractor import SkillExtractor
-from app.services.embedding_service import EmbeddingService, embedding_service
+from app.services.embedding_service import EmbeddingService, embedding_service, embedding_batcher
 from app.services.skill_gap_service import SkillGapService
 
 __all__ = [
@@ -9,5 +9,6 @@ __all__ = [
     "SkillExtractor",
     "EmbeddingService",
     "embedding_service",
+    "embedding_batcher",
     "SkillGapService"
 ]
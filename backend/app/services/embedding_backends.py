@@ -0,0 +1,241 @@
+import abc
+import os
+import re
+from typing import List, Optional, Union
+
+import numpy as np
+from loguru import logger
+
+
+class EmbeddingBackend(abc.ABC):
+    """
+    Runs the sentence embedding model.
+
+    Backends mirror the part of the ``SentenceTransformer.encode`` API the
+    service uses: a single string gives a 1-D vector, a list gives a 2-D
+    array with one row per text.
+    """
+
+    name = "base"
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def encode(self, texts: Union[str, List[str]], convert_to_numpy: bool = True) -> np.ndarray:
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        if not batch:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        embeddings = self._encode_batch(batch)
+        return embeddings[0] if single else embeddings
+
+    @abc.abstractmethod
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed a non-empty list of texts into a 2-D float32 array."""
+
+    @property
+    @abc.abstractmethod
+    def dimension(self) -> int:
+        """Length of one embedding vector."""
+
+
+class TorchBackend(EmbeddingBackend):
+    """
+    The reference PyTorch ``SentenceTransformer``.
+
+    ``device`` is passed through to torch (``cpu``, ``cuda``, ``cuda:1``,
+    ``mps``); None lets SentenceTransformer pick a GPU when one is available.
+    """
+
+    name = "torch"
+
+    def __init__(self, model_name: str, device: Optional[str] = None):
+        super().__init__(model_name)
+        # Deferred: importing sentence_transformers pulls in torch
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name, device=device)
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, convert_to_numpy=True).astype(np.float32, copy=False)
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+
+class OnnxBackend(EmbeddingBackend):
+    """
+    The transformer exported to ONNX and run with ONNX Runtime.
+
+    The export happens once per model and is reused from ``export_dir``.
+    Pooling and normalization are done in numpy the same way the
+    SentenceTransformer pipeline does them (mean over non-padding tokens,
+    then L2 if the model ends with a Normalize module). With ``quantize`` the
+    exported graph is dynamically quantized to int8 weights first.
+
+    The session runs on CUDA when ``device`` names a CUDA device, or when it
+    is None and ONNX Runtime has the CUDA provider; otherwise on the CPU.
+    """
+
+    name = "onnx"
+
+    def __init__(
+        self,
+        model_name: str,
+        export_dir: str,
+        quantize: bool = False,
+        intra_op_threads: int = 0,
+        device: Optional[str] = None
+    ):
+        super().__init__(model_name)
+        self.device = device
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.quantize = quantize
+        if quantize:
+            self.name = "onnx-int8"
+        model_dir = os.path.join(export_dir, re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name))
+        model_path = self._ensure_exported(model_dir)
+        if quantize:
+            model_path = self._ensure_quantized(model_path)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+        if device is None:
+            use_cuda = "CUDAExecutionProvider" in ort.get_available_providers()
+        else:
+            use_cuda = device.startswith("cuda")
+        providers = ["CPUExecutionProvider"]
+        if use_cuda:
+            device_id = int(device.partition(":")[2] or 0) if device else 0
+            providers.insert(0, ("CUDAExecutionProvider", {"device_id": device_id}))
+        self.session = ort.InferenceSession(model_path, options, providers=providers)
+        self.input_names = {node.name for node in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.max_seq_length = int(self._read_marker(model_dir, "max_seq_length"))
+        self.normalize = self._read_marker(model_dir, "normalize") == "1"
+        self._dimension = int(self._read_marker(model_dir, "dimension"))
+
+    @staticmethod
+    def _read_marker(model_dir: str, name: str) -> str:
+        with open(os.path.join(model_dir, name)) as f:
+            return f.read().strip()
+
+    @staticmethod
+    def _write_marker(model_dir: str, name: str, value) -> None:
+        with open(os.path.join(model_dir, name), "w") as f:
+            f.write(str(value))
+
+    def _ensure_exported(self, model_dir: str) -> str:
+        model_path = os.path.join(model_dir, "model.onnx")
+        if os.path.exists(model_path):
+            return model_path
+
+        import torch
+        from sentence_transformers import SentenceTransformer
+        from sentence_transformers.models import Normalize
+
+        logger.info(f"Exporting {self.model_name} to ONNX in {model_dir}")
+        os.makedirs(model_dir, exist_ok=True)
+        st_model = SentenceTransformer(self.model_name, device=self.device)
+        transformer = st_model[0].auto_model.eval()
+        tokenizer = st_model.tokenizer
+        sample = tokenizer(["export sample"], return_tensors="pt").to(transformer.device)
+        input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+        tmp_path = model_path + ".tmp"
+        with torch.no_grad():
+            torch.onnx.export(
+                transformer,
+                tuple(sample[name] for name in input_names),
+                tmp_path,
+                input_names=input_names,
+                output_names=["last_hidden_state"],
+                dynamic_axes=dynamic_axes,
+                opset_version=14
+            )
+        tokenizer.save_pretrained(model_dir)
+        self._write_marker(model_dir, "max_seq_length", st_model.max_seq_length)
+        self._write_marker(model_dir, "normalize", int(any(isinstance(m, Normalize) for m in st_model)))
+        self._write_marker(model_dir, "dimension", st_model.get_sentence_embedding_dimension())
+        os.replace(tmp_path, model_path)
+        return model_path
+
+    @staticmethod
+    def _ensure_quantized(model_path: str) -> str:
+        quantized_path = model_path.replace(".onnx", ".int8.onnx")
+        if os.path.exists(quantized_path):
+            return quantized_path
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logger.info(f"Quantizing {model_path} to int8")
+        tmp_path = quantized_path + ".tmp"
+        quantize_dynamic(model_path, tmp_path, weight_type=QuantType.QInt8)
+        os.replace(tmp_path, quantized_path)
+        return quantized_path
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_tensors="np"
+        )
+        inputs = {
+            name: encoded[name].astype(np.int64)
+            for name in self.input_names if name in encoded
+        }
+        hidden = self.session.run(["last_hidden_state"], inputs)[0]
+        mask = encoded["attention_mask"].astype(np.float32)[:, :, None]
+        embeddings = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        if self.normalize:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.maximum(norms, 1e-12)
+        return embeddings.astype(np.float32, copy=False)
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+def create_backend(
+    name: str,
+    model_name: str,
+    export_dir: str = "./models/onnx",
+    intra_op_threads: int = 0,
+    device: Optional[str] = None
+) -> EmbeddingBackend:
+    """
+    Build an embedding backend by name.
+
+    Args:
+        name: One of ``torch``, ``onnx`` or ``onnx-int8``
+        model_name: SentenceTransformer model name or path
+        export_dir: Where exported ONNX graphs are kept
+        intra_op_threads: ONNX Runtime threads per session (0 = runtime default)
+        device: Device to run on, e.g. ``cpu`` or ``cuda:0``; None picks a GPU
+            when one is available
+
+    Raises:
+        ValueError: if the backend name is unknown
+    """
+    if name == "torch":
+        return TorchBackend(model_name, device=device)
+    if name in ("onnx", "onnx-int8"):
+        return OnnxBackend(
+            model_name,
+            export_dir=export_dir,
+            quantize=name == "onnx-int8",
+            intra_op_threads=intra_op_threads,
+            device=device
+        )
+    raise ValueError(f"Unknown embedding backend '{name}', expected one of {', '.join(BACKENDS)}")
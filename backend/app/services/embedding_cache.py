@@ -0,0 +1,267 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from loguru import logger
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially reformatted text shares a cache entry."""
+    return " ".join(text.split())
+
+
+def make_cache_key(model_name: str, text: str) -> str:
+    """Content address for an embedding: model name plus normalized text hash."""
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model_name}:{digest}"
+
+
+class SQLiteEmbeddingStore:
+    """
+    On-disk embedding tier shared by every worker on the host.
+
+    Vectors are stored as raw float32 bytes and every row records the model
+    that produced it. Workers running different models share the file and
+    only read their own rows. WAL mode lets several uvicorn workers read while
+    one writes.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " dim INTEGER NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_embeddings_model ON embeddings (model)")
+        self._conn.commit()
+
+    def get_many(self, model_name: str, keys: List[str]) -> Dict[str, np.ndarray]:
+        if not keys:
+            return {}
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE model = ? AND key IN ({placeholders})",
+                    [model_name, *chunk]
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, model_name: str, items: Dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        now = time.time()
+        rows = [
+            (key, model_name, int(vector.shape[0]), vector.astype(np.float32).tobytes(), now)
+            for key, vector in items.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, dim, vector, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingCache:
+    """
+    Two-tier, content-addressed embedding cache.
+
+    The first tier is an in-process LRU bounded by entry count and by bytes.
+    The optional second tier is a SQLite store; memory misses fall through to
+    it and disk hits are promoted back into memory. The store is opened by
+    ``open_disk()`` (called from the app lifespan), so constructing the cache
+    never touches the filesystem.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        max_entries: int = 10000,
+        max_bytes: int = 256 * 1024 * 1024,
+        disk_path: Optional[str] = None
+    ):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.disk_path = disk_path
+        self.disk: Optional[SQLiteEmbeddingStore] = None
+
+    def open_disk(self) -> bool:
+        """
+        Open the disk tier if one is configured and it is not open yet.
+
+        Returns:
+            True if the disk tier is available
+        """
+        with self._lock:
+            if self.disk is None and self.disk_path:
+                try:
+                    self.disk = SQLiteEmbeddingStore(self.disk_path)
+                except Exception as e:
+                    logger.error(f"Embedding disk cache disabled: {e}")
+                    self.disk_path = None
+            return self.disk is not None
+
+    def close(self) -> None:
+        with self._lock:
+            disk, self.disk = self.disk, None
+        if disk is not None:
+            disk.close()
+
+    def key(self, text: str) -> str:
+        return make_cache_key(self.model_name, text)
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        return self.get_many([text]).get(0)
+
+    def get_many(
+        self,
+        texts: List[str],
+        use_disk: bool = True,
+        count_misses: bool = True
+    ) -> Dict[int, np.ndarray]:
+        """
+        Look up several texts at once.
+
+        Args:
+            texts: Texts to look up
+            use_disk: Fall through to the disk tier on memory misses
+            count_misses: Record misses in the stats; callers that look the
+                same texts up again later pass False to avoid counting twice
+
+        Returns:
+            Mapping of position in ``texts`` to the cached vector, hits only
+        """
+        keys = [self.key(text) for text in texts]
+        found: Dict[int, np.ndarray] = {}
+        missing: Dict[str, List[int]] = {}
+        with self._lock:
+            for idx, key in enumerate(keys):
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[idx] = vector
+                    self.hits += 1
+                else:
+                    missing.setdefault(key, []).append(idx)
+
+        if missing and use_disk and self.disk is not None:
+            try:
+                from_disk = self.disk.get_many(self.model_name, list(missing.keys()))
+            except Exception as e:
+                logger.error(f"Embedding disk cache read failed: {e}")
+                from_disk = {}
+            disk_hits = 0
+            for key, vector in from_disk.items():
+                self._remember(key, vector)
+                for idx in missing.pop(key):
+                    found[idx] = vector
+                    disk_hits += 1
+            with self._lock:
+                self.disk_hits += disk_hits
+
+        if missing and count_misses:
+            with self._lock:
+                self.misses += sum(len(indices) for indices in missing.values())
+        return found
+
+    def put(self, text: str, vector: np.ndarray) -> None:
+        self.put_many([text], [vector])
+
+    def put_many(self, texts: Iterable[str], vectors: Iterable[np.ndarray]) -> None:
+        items = {}
+        for text, vector in zip(texts, vectors):
+            vector = np.array(vector, dtype=np.float32)
+            key = self.key(text)
+            self._remember(key, vector)
+            items[key] = vector
+        if self.disk is not None:
+            try:
+                self.disk.put_many(self.model_name, items)
+            except Exception as e:
+                logger.error(f"Embedding disk cache write failed: {e}")
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        # Cached arrays are shared between callers, so freeze them
+        vector.setflags(write=False)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = vector
+            self._bytes += vector.nbytes
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def invalidate(self, model_name: Optional[str] = None) -> None:
+        """
+        Drop the cached vectors.
+
+        When ``model_name`` is given the cache switches to that model and the
+        disk tier is kept: its rows are keyed by model, so other workers still
+        using the previous model keep their entries.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if model_name:
+            self.model_name = model_name
+        elif self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "model": self.model_name,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "disk_enabled": self.disk is not None
+        }
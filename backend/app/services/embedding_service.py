@@ -1,23 +1,136 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import time
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 from typing import List, Dict, Optional
 from loguru import logger
 from app.core.config import settings
+from app.core.executor import execution
+from app.core.metrics import MODEL_BATCH_SIZE
+from app.core.profiling import active_profile, follow_all
+from app.core.vectors import l2_normalize
+from app.services.embedding_backends import EmbeddingBackend, create_backend
+from app.services.embedding_cache import EmbeddingCache
+from app.services.text_chunker import split_into_chunks
 
 class EmbeddingService:
-    """Service for generating and comparing embeddings."""
+    """
+    Service for generating and comparing embeddings.
+    
+    Embeddings are float32 ndarrays, L2-normalized when they are created, so
+    cosine similarity is a plain dot product.
+    
+    Long resumes can be embedded chunk by chunk (EMBEDDING_CHUNKING). In
+    ``mean`` mode the chunk vectors are averaged into one document vector;
+    in ``max_sim`` mode a resume is a matrix with one row per chunk and its
+    similarity to a job is that of its best-matching chunk.
+    """
     
     def __init__(self):
-        """Initialize the embedding model."""
-        try:
-            self.model = SentenceTransformer(settings.EMBEDDING_MODEL)
-            logger.info(f"Loaded embedding model: {settings.EMBEDDING_MODEL}")
-        except Exception as e:
-            logger.error(f"Error loading embedding model: {e}")
-            self.model = None
+        """
+        Set up the service without loading the model.
+        
+        The model is loaded by ``load()`` (called from the app lifespan) or
+        on first use, so importing this module stays cheap.
+        """
+        self.model_name = settings.EMBEDDING_MODEL
+        self.backend_name = settings.EMBEDDING_BACKEND
+        self.chunking = settings.EMBEDDING_CHUNKING
+        self.cache = EmbeddingCache(
+            model_name=self.model_id,
+            max_entries=settings.EMBEDDING_CACHE_SIZE,
+            max_bytes=settings.EMBEDDING_CACHE_MAX_BYTES,
+            disk_path=settings.EMBEDDING_CACHE_PATH or None
+        )
+        self._model: Optional[EmbeddingBackend] = None
+        self._load_lock = threading.Lock()
+        self.load_error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+    
+    @property
+    def model_id(self) -> str:
+        """
+        Model and backend that produce the vectors.
+        
+        Quantized backends drift slightly from the reference model, so cached
+        vectors are keyed by both.
+        """
+        return f"{self.model_name}@{self.backend_name}"
     
-    def generate_embedding(self, text: str) -> Optional[List[float]]:
+    @property
+    def resume_embedding_id(self) -> str:
+        """
+        Model plus the chunking settings that shape a resume embedding.
+        
+        Chunk vectors themselves only depend on ``model_id``, but a resume
+        embedding built with other chunking settings is a different vector.
+        """
+        if self.chunking == "none":
+            return self.model_id
+        return (
+            f"{self.model_id}/chunks-{self.chunking}-"
+            f"{settings.EMBEDDING_CHUNK_WORDS}-{settings.EMBEDDING_CHUNK_OVERLAP_WORDS}"
+        )
+    
+    @property
+    def model(self) -> Optional[EmbeddingBackend]:
+        """The embedding backend, loaded on first access."""
+        if self._model is None and self.load_error is None:
+            self.load()
+        return self._model
+    
+    @property
+    def is_ready(self) -> bool:
+        return self._model is not None
+    
+    def load(self) -> bool:
+        """
+        Load the embedding model if it is not loaded yet.
+        
+        Returns:
+            True if the model is available
+        """
+        with self._load_lock:
+            if self._model is not None:
+                return True
+            started = time.perf_counter()
+            try:
+                self._model = self._create_backend(self.model_name, self.backend_name)
+                self.load_error = None
+                self.load_seconds = time.perf_counter() - started
+                logger.info(
+                    f"Loaded embedding model: {self.model_id} in {self.load_seconds:.2f}s"
+                )
+            except Exception as e:
+                logger.error(f"Error loading embedding model: {e}")
+                self.load_error = str(e)
+                self._model = None
+            return self._model is not None
+    
+    @staticmethod
+    def _create_backend(model_name: str, backend_name: str) -> EmbeddingBackend:
+        return create_backend(
+            backend_name,
+            model_name,
+            export_dir=settings.EMBEDDING_ONNX_DIR,
+            intra_op_threads=settings.EMBEDDING_ONNX_THREADS,
+            device=settings.EMBEDDING_DEVICE or None
+        )
+    
+    def warmup(self) -> None:
+        """Run one throwaway encode so the first request does not pay for it."""
+        model = self.model
+        if model is None:
+            return
+        started = time.perf_counter()
+        model.encode(["warmup"], convert_to_numpy=True)
+        self.warmup_seconds = time.perf_counter() - started
+        logger.info(f"Embedding model warmed up in {self.warmup_seconds:.2f}s")
+    
+    def generate_embedding(self, text: str) -> Optional[np.ndarray]:
         """
         Generate embedding for a given text.
         
@@ -25,20 +138,26 @@ class EmbeddingService:
             text: Input text
             
         Returns:
-            Embedding vector as list of floats
+            Unit-length float32 embedding vector
         """
+        cached = self.cache.get(text)
+        if cached is not None:
+            return cached
+        
         if not self.model:
             logger.error("Embedding model not initialized")
             return None
         
         try:
-            embedding = self.model.encode(text, convert_to_numpy=True)
-            return embedding.tolist()
+            MODEL_BATCH_SIZE.observe(1)
+            embedding = l2_normalize(self.model.encode(text, convert_to_numpy=True))
+            self.cache.put(text, embedding)
+            return embedding
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
             return None
     
-    def generate_embeddings_batch(self, texts: List[str]) -> Optional[List[List[float]]]:
+    def generate_embeddings_batch(self, texts: List[str]) -> Optional[np.ndarray]:
         """
         Generate embeddings for multiple texts.
         
@@ -46,59 +165,154 @@ class EmbeddingService:
             texts: List of input texts
             
         Returns:
-            List of embedding vectors
+            Float32 array with one unit-length row per text
         """
-        if not self.model:
-            logger.error("Embedding model not initialized")
-            return None
-        
         try:
-            embeddings = self.model.encode(texts, convert_to_numpy=True)
-            return [emb.tolist() for emb in embeddings]
+            results = self.cache.get_many(texts)
+            pending = [idx for idx in range(len(texts)) if idx not in results]
+            if pending:
+                if not self.model:
+                    logger.error("Embedding model not initialized")
+                    return None
+                pending_texts = [texts[idx] for idx in pending]
+                MODEL_BATCH_SIZE.observe(len(pending_texts))
+                embeddings = l2_normalize(self.model.encode(pending_texts, convert_to_numpy=True))
+                self.cache.put_many(pending_texts, embeddings)
+                for idx, emb in zip(pending, embeddings):
+                    results[idx] = emb
+            if not texts:
+                return np.zeros((0, 0), dtype=np.float32)
+            return np.stack([results[idx] for idx in range(len(texts))])
         except Exception as e:
             logger.error(f"Error generating batch embeddings: {e}")
             return None
     
-    def compute_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
+    def chunk_text(self, text: str) -> List[str]:
+        """
+        Split a resume into the texts that are embedded for it.
+        
+        Returns:
+            Overlapping chunks when chunking is enabled, otherwise ``[text]``
+        """
+        if self.chunking == "none":
+            return [text]
+        return split_into_chunks(
+            text,
+            max_words=settings.EMBEDDING_CHUNK_WORDS,
+            overlap_words=settings.EMBEDDING_CHUNK_OVERLAP_WORDS
+        ) or [text]
+    
+    def combine_chunks(self, chunk_embeddings: np.ndarray) -> np.ndarray:
+        """
+        Turn the embeddings of a resume's chunks into its resume embedding.
+        
+        Args:
+            chunk_embeddings: Unit-length chunk vectors, one per row
+            
+        Returns:
+            A 1-D vector, or the chunk matrix itself in ``max_sim`` mode
+        """
+        if len(chunk_embeddings) == 1:
+            return chunk_embeddings[0]
+        if self.chunking == "max_sim":
+            return chunk_embeddings
+        return self.document_vector(chunk_embeddings)
+    
+    @staticmethod
+    def document_vector(embedding: np.ndarray) -> np.ndarray:
+        """Single unit-length vector for storage and index search."""
+        if embedding.ndim == 1:
+            return embedding
+        return l2_normalize(embedding.mean(axis=0))
+    
+    def generate_resume_embedding(self, text: str) -> Optional[np.ndarray]:
+        """
+        Embed a resume, chunk by chunk when chunking is enabled.
+        
+        Chunks are cached individually, so after an edit only the chunks
+        that changed are encoded again.
+        
+        Returns:
+            See ``combine_chunks``
+        """
+        chunks = self.chunk_text(text)
+        if len(chunks) == 1:
+            return self.generate_embedding(text)
+        embeddings = self.generate_embeddings_batch(chunks)
+        return self.combine_chunks(embeddings) if embeddings is not None else None
+    
+    def reload_model(self, model_name: str, backend_name: Optional[str] = None) -> None:
+        """
+        Switch to a different embedding model or backend.
+        
+        The in-process cache is dropped; disk-cached vectors of the previous
+        model stay for workers still using it.
+        """
+        backend_name = backend_name or self.backend_name
+        self._model = self._create_backend(model_name, backend_name)
+        self.model_name = model_name
+        self.backend_name = backend_name
+        self.cache.invalidate(self.model_id)
+        logger.info(f"Loaded embedding model: {self.model_id}")
+    
+    def compute_similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """
         Compute cosine similarity between two embeddings.
         
         Args:
-            embedding1: First embedding vector
-            embedding2: Second embedding vector
+            embedding1: First unit-length embedding vector, or a chunk matrix
+                scored by its best-matching row
+            embedding2: Second unit-length embedding vector
             
         Returns:
             Similarity score (0-1)
         """
         try:
-            emb1 = np.array(embedding1).reshape(1, -1)
-            emb2 = np.array(embedding2).reshape(1, -1)
-            similarity = cosine_similarity(emb1, emb2)[0][0]
-            return float(similarity)
+            return float(np.max(np.dot(embedding1, embedding2)))
         except Exception as e:
             logger.error(f"Error computing similarity: {e}")
             return 0.0
     
+    def compute_similarities(
+        self,
+        query_embedding: np.ndarray,
+        candidate_embeddings: np.ndarray
+    ) -> List[float]:
+        """
+        Compute cosine similarity of one query against many candidates.
+        
+        Uses a single matrix-vector product over the stacked candidates.
+        
+        Args:
+            query_embedding: Unit-length query embedding vector, or a chunk
+                matrix scored by its best-matching row
+            candidate_embeddings: Unit-length candidate vectors, one per row
+            
+        Returns:
+            Similarity scores in candidate order
+        """
+        scores = np.asarray(candidate_embeddings) @ np.asarray(query_embedding).T
+        if scores.ndim == 2:
+            scores = scores.max(axis=1)
+        return scores.tolist()
+    
     def rank_by_similarity(
         self,
-        query_embedding: List[float],
-        candidate_embeddings: List[List[float]]
+        query_embedding: np.ndarray,
+        candidate_embeddings: np.ndarray
     ) -> List[Dict[str, float]]:
         """
         Rank candidates by similarity to query.
         
         Args:
-            query_embedding: Query embedding vector
-            candidate_embeddings: List of candidate embedding vectors
+            query_embedding: Unit-length query embedding vector
+            candidate_embeddings: Unit-length candidate vectors, one per row
             
         Returns:
             List of dictionaries with index and similarity score, sorted by score
         """
         try:
-            query = np.array(query_embedding).reshape(1, -1)
-            candidates = np.array(candidate_embeddings)
-            
-            similarities = cosine_similarity(query, candidates)[0]
+            similarities = self.compute_similarities(query_embedding, candidate_embeddings)
             
             # Create list of (index, score) and sort by score
             ranked = [
@@ -112,5 +326,136 @@ class EmbeddingService:
             logger.error(f"Error ranking by similarity: {e}")
             return []
 
+class EmbeddingBatcher:
+    """
+    Dynamic micro-batching in front of the embedding model.
+
+    Concurrent ``embed`` calls are queued and collected for at most
+    ``max_wait_ms`` (or until ``max_batch_size`` texts are waiting), sorted by
+    length to reduce padding, encoded with one ``encode`` call on the worker
+    pool and handed back to their callers. Texts already in the embedding
+    cache are answered before queueing, so they never wait for a batch.
+    """
+    
+    def __init__(self, service: EmbeddingService, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.service = service
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.batches = 0
+        self.batched_texts = 0
+    
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        """
+        Queue a text for the next batch and wait for its embedding.
+        
+        Returns:
+            Unit-length float32 embedding vector, or None on failure
+        """
+        return (await self.embed_many([text]))[0]
+    
+    async def embed_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Queue the uncached texts; they may be spread across batches."""
+        cache = self.service.cache
+        # Memory hits are a dict lookup; only the disk tier needs a thread
+        found = cache.get_many(texts, use_disk=False, count_misses=False)
+        missing = [idx for idx in range(len(texts)) if idx not in found]
+        if missing and cache.disk is not None:
+            from_disk = await execution.run_in_thread(
+                cache.get_many, [texts[idx] for idx in missing], count_misses=False
+            )
+            for position, vector in from_disk.items():
+                found[missing[position]] = vector
+            missing = [idx for idx in missing if idx not in found]
+        if missing:
+            self._ensure_worker()
+            profile = active_profile.get()
+            futures = []
+            for idx in missing:
+                future = self._loop.create_future()
+                self._queue.put_nowait((texts[idx], future, profile))
+                futures.append(future)
+            for idx, embedding in zip(missing, await asyncio.gather(*futures)):
+                found[idx] = embedding
+        return [found[idx] for idx in range(len(texts))]
+    
+    async def embed_resume(self, text: str) -> Optional[np.ndarray]:
+        """
+        Batched counterpart of ``EmbeddingService.generate_resume_embedding``.
+        
+        Chunks of one resume are queued together and share batches with
+        other requests.
+        """
+        chunks = self.service.chunk_text(text)
+        if len(chunks) == 1:
+            return await self.embed(text)
+        embeddings = await self.embed_many(chunks)
+        if any(embedding is None for embedding in embeddings):
+            return None
+        return self.service.combine_chunks(np.stack(embeddings))
+    
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            # A fresh context, so the worker does not keep the first caller's profile
+            self._worker = contextvars.Context().run(loop.create_task, self._run())
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._dispatch(batch)
+    
+    async def _dispatch(self, batch: List[tuple]) -> None:
+        batch = [item for item in batch if not item[1].done()]
+        if not batch:
+            return
+        # Similar lengths in one call means less padding inside the model
+        batch.sort(key=lambda item: len(item[0]))
+        texts = [text for text, _, _ in batch]
+        # Every profiled request in the batch samples the shared encode
+        profiles = {profile for _, _, profile in batch if profile is not None}
+        call = follow_all(profiles, functools.partial(self.service.generate_embeddings_batch, texts))
+        try:
+            embeddings = await execution.run_in_thread(call)
+        except Exception as e:
+            logger.error(f"Error in embedding batch: {e}")
+            embeddings = None
+        self.batches += 1
+        self.batched_texts += len(texts)
+        for idx, (_, future, _) in enumerate(batch):
+            if not future.done():
+                future.set_result(embeddings[idx] if embeddings is not None else None)
+    
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "texts": self.batched_texts,
+            "avg_batch_size": round(self.batched_texts / self.batches, 2) if self.batches else 0.0
+        }
+
 # Global embedding service instance
 embedding_service = EmbeddingService()
+embedding_batcher = EmbeddingBatcher(
+    embedding_service,
+    max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+    max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS
+)
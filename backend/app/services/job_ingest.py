@@ -0,0 +1,276 @@
+import asyncio
+import json
+import os
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from typing import AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.core.executor import execution
+from app.models.models import JobDescription
+from app.services.embedding_service import embedding_service
+from app.services.skill_extractor import SkillExtractor
+
+
+def extract_skills_many(descriptions: List[str]) -> List[List[str]]:
+    """Skill extraction for a slice of a chunk; runs in a worker process."""
+    return [SkillExtractor.extract_skills(description) for description in descriptions]
+
+
+@dataclass
+class IngestJob:
+    line: int
+    title: str
+    description: str
+    job_id: Optional[int] = None
+    stored: bool = False  # already in the database; only the index needs it
+
+
+@dataclass
+class IngestStats:
+    lines: int = 0
+    skipped: int = 0  # already committed by a previous run
+    replayed: int = 0  # stored by a previous run but not yet in an index snapshot
+    invalid: int = 0
+    ingested: int = 0
+    stored: int = 0
+    indexed: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def jobs_per_second(self) -> float:
+        return round(self.ingested / self.elapsed_seconds, 1) if self.elapsed_seconds else 0.0
+
+    def as_dict(self) -> Dict[str, object]:
+        payload = asdict(self)
+        payload["elapsed_seconds"] = round(self.elapsed_seconds, 3)
+        payload["jobs_per_second"] = self.jobs_per_second
+        return payload
+
+
+class IngestCheckpoint:
+    """
+    Progress of an ingestion, kept in a small JSON file.
+
+    ``offset`` is the number of input lines written to the database and
+    ``indexed_offset`` the number covered by the last vector index snapshot.
+    A rerun over the same input skips lines up to ``indexed_offset`` and
+    re-adds the lines between the two offsets to the index only, so an
+    interrupted ingestion resumes where it stopped instead of starting over.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.offset = 0
+        self.indexed_offset = 0
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+            self.offset = int(payload.get("offset", 0))
+            self.indexed_offset = int(payload.get("indexed_offset", self.offset))
+
+    @staticmethod
+    def for_name(directory: str, name: str) -> "IngestCheckpoint":
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+        return IngestCheckpoint(os.path.join(directory, f"{safe}.json"))
+
+    def save(self, offset: int, indexed_offset: int, stats: IngestStats) -> None:
+        self.offset = offset
+        self.indexed_offset = indexed_offset
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({
+                "offset": offset,
+                "indexed_offset": indexed_offset,
+                "updated_at": time.time(),
+                "stats": stats.as_dict()
+            }, handle)
+        os.replace(tmp_path, self.path)
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines without reading it all."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8", errors="replace")
+    if buffer:
+        yield buffer.decode("utf-8", errors="replace")
+
+
+class JobIngestor:
+    """
+    Bulk job-description ingestion from NDJSON.
+
+    Each line is a JSON object with ``title`` and ``description`` and an
+    integer ``job_id`` used as the vector index key; ``job_id`` is optional
+    when no index is being built. Lines are read
+    lazily and processed in chunks: skill extraction fans out over the
+    process pool while the chunk is embedded in one batch, then the chunk is
+    written to the database and the vector index and the checkpoint moves
+    past it. Reading and processing the next chunk overlaps with committing
+    the current one.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        index=None,
+        chunk_size: int = 512,
+        checkpoint: Optional[IngestCheckpoint] = None,
+        snapshot_every: int = 20
+    ):
+        self.session_factory = session_factory
+        self.index = index
+        self.chunk_size = max(1, chunk_size)
+        self.checkpoint = checkpoint or IngestCheckpoint(None)
+        self.snapshot_every = max(1, snapshot_every)
+        self.stats = IngestStats()
+
+    def _parse(self, line_no: int, line: str) -> Optional[IngestJob]:
+        try:
+            item = json.loads(line)
+            title = str(item.get("title") or "").strip()
+            description = str(item.get("description") or "").strip()
+            if not description:
+                raise ValueError("missing description")
+            job_id = item.get("job_id")
+            if job_id is None and self.index is not None:
+                raise ValueError("missing job_id, required when indexing")
+            return IngestJob(
+                line=line_no,
+                title=title or "Untitled",
+                description=description,
+                job_id=int(job_id) if job_id is not None else None
+            )
+        except (ValueError, TypeError, AttributeError) as e:
+            self.stats.invalid += 1
+            if len(self.stats.errors) < 100:
+                self.stats.errors.append(f"line {line_no}: {e}")
+            return None
+
+    async def _chunks(self, lines: AsyncIterable[str]) -> AsyncIterator[Tuple[int, List[IngestJob]]]:
+        chunk: List[IngestJob] = []
+        line_no = 0
+        # The checkpoint advances while later chunks are read
+        skip_through, stored_through = self.checkpoint.indexed_offset, self.checkpoint.offset
+        async for line in lines:
+            line_no += 1
+            if line_no <= skip_through:
+                self.stats.skipped += 1
+                continue
+            if not line.strip():
+                continue
+            self.stats.lines += 1
+            job = self._parse(line_no, line)
+            if job is not None:
+                job.stored = line_no <= stored_through
+                chunk.append(job)
+            if len(chunk) >= self.chunk_size:
+                yield line_no, chunk
+                chunk = []
+        yield line_no, chunk
+
+    async def _analyze(self, jobs: List[IngestJob]):
+        descriptions = [job.description for job in jobs]
+        workers = max(1, execution.process_workers)
+        step = -(-len(descriptions) // workers)
+        loop = asyncio.get_running_loop()
+        skill_slices, embeddings = await asyncio.gather(
+            asyncio.gather(*(
+                loop.run_in_executor(execution.process_pool, extract_skills_many, descriptions[start:start + step])
+                for start in range(0, len(descriptions), step)
+            )),
+            execution.run_in_thread(embedding_service.generate_embeddings_batch, descriptions)
+        )
+        skills = [item for part in skill_slices for item in part]
+        if embeddings is None:
+            raise RuntimeError("Failed to generate embeddings")
+        return skills, embeddings
+
+    async def _store(self, jobs: List[IngestJob], skills, embeddings) -> None:
+        if self.session_factory is not None:
+            rows = [
+                JobDescription(
+                    title=job.title,
+                    description=job.description,
+                    skills_required=job_skills,
+                    embedding=embedding
+                )
+                for job, job_skills, embedding in zip(jobs, skills, embeddings)
+                if not job.stored
+            ]
+            if rows:
+                async with self.session_factory() as session:
+                    session.add_all(rows)
+                    await session.commit()
+            self.stats.stored += len(rows)
+        self.stats.replayed += sum(1 for job in jobs if job.stored)
+
+    async def _index(self, jobs: List[IngestJob], skills, embeddings) -> None:
+        if self.index is not None:
+            # Adding is keyed by job ID, so replayed jobs simply replace themselves
+            await execution.run_in_thread(
+                self.index.add,
+                [job.job_id for job in jobs],
+                embeddings,
+                [{"title": job.title, "skills": job_skills} for job, job_skills in zip(jobs, skills)]
+            )
+            self.stats.indexed += len(jobs)
+
+    async def run(self, lines: AsyncIterable[str]) -> IngestStats:
+        """Ingest every line after the checkpoint and return the run statistics."""
+        started = time.perf_counter()
+        pending: Optional[Tuple[int, List[IngestJob], asyncio.Task]] = None
+        # Last line whose job is in the in-memory index
+        added_offset = self.checkpoint.indexed_offset
+
+        async def finish(offset: int, jobs: List[IngestJob], task: asyncio.Task) -> None:
+            nonlocal added_offset
+            if jobs:
+                skills, embeddings = await task
+                await self._store(jobs, skills, embeddings)
+            # Stored rows are never written twice; lines only count as indexed
+            # once a snapshot holding them is on disk
+            indexed_offset = offset if self.index is None else self.checkpoint.indexed_offset
+            self.checkpoint.save(offset, indexed_offset, self.stats)
+            if jobs:
+                await self._index(jobs, skills, embeddings)
+                self.stats.ingested += len(jobs)
+                self.stats.chunks += 1
+            added_offset = offset
+            if self.index is not None and jobs and self.stats.chunks % self.snapshot_every == 0:
+                await execution.run_in_thread(self.index.snapshot)
+                self.checkpoint.save(offset, offset, self.stats)
+            self.stats.elapsed_seconds = time.perf_counter() - started
+            logger.info(
+                f"Ingested {self.stats.ingested} jobs ({self.stats.invalid} invalid) "
+                f"at {self.stats.jobs_per_second} jobs/s"
+            )
+
+        try:
+            async for offset, jobs in self._chunks(lines):
+                task = asyncio.create_task(self._analyze(jobs)) if jobs else None
+                if pending is not None:
+                    await finish(*pending)
+                pending = (offset, jobs, task)
+            if pending is not None:
+                await finish(*pending)
+                pending = None
+        finally:
+            if pending is not None and pending[2] is not None:
+                pending[2].cancel()
+            if self.index is not None:
+                await execution.run_in_thread(self.index.snapshot)
+                self.checkpoint.save(self.checkpoint.offset, added_offset, self.stats)
+            self.stats.elapsed_seconds = time.perf_counter() - started
+        return self.stats
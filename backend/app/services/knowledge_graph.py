@@ -1,11 +1,20 @@
+import hashlib
+import heapq
 import json
 import os
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, TypeVar
 
+import numpy as np
+from loguru import logger
+
+from app.services.role_scorer import RoleFitScorer
 from app.services.skill_extractor import SkillExtractor
 
 GRAPH_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "knowledge_graph.json")
 
+K = TypeVar("K")
+
 
 def _canonicalize(value: str) -> str:
     lowered = value.strip().lower()
@@ -20,18 +29,60 @@ def _canonicalize(value: str) -> str:
 
 
 class KnowledgeGraph:
-    def __init__(self, data: Dict[str, object]):
+    def __init__(self, data: Dict[str, object], version: str = ""):
+        self.version = version
         self.skills = set(data.get("skills", []))
         self.roles = data.get("roles", {})
         self.courses = data.get("courses", [])
         self.certifications = data.get("certifications", [])
         self.prereqs = data.get("prereqs", {})
 
+        # Derived structures, built once so request handlers only read them
+        self.role_skill_sets = {role_key: frozenset(skills) for role_key, skills in self.roles.items()}
+        self.course_skill_sets = [frozenset(course.get("skills", [])) for course in self.courses]
+        self.cert_skill_sets = [frozenset(cert.get("skills", [])) for cert in self.certifications]
+
+        # Inverted indexes: skill -> entries (in catalog order) that teach/need it
+        self.skill_to_courses = self._invert(enumerate(self.course_skill_sets))
+        self.skill_to_certs = self._invert(enumerate(self.cert_skill_sets))
+        self.role_scorer = RoleFitScorer(self.role_skill_sets)
+        self.role_index = {role_key: idx for idx, role_key in enumerate(self.role_scorer.role_keys)}
+
+        # Prerequisite order: a global topological rank and each skill's
+        # transitive prerequisites, so ordering a request is a single sort
+        self.prereq_cycles: List[List[str]] = []
+        self.prereq_rank, self.prereq_closure = self._build_prereq_order()
+        if self.prereq_cycles:
+            for cycle in self.prereq_cycles:
+                logger.warning(f"Prerequisite cycle ignored: {' -> '.join(cycle)}")
+
+    @classmethod
+    def load(cls, path: str = GRAPH_PATH) -> "KnowledgeGraph":
+        with open(path, "rb") as handle:
+            raw = handle.read()
+        return cls.from_bytes(raw)
+
     @classmethod
-    def load(cls) -> "KnowledgeGraph":
-        with open(GRAPH_PATH, "r", encoding="utf-8") as handle:
-            data = json.load(handle)
-        return cls(data)
+    def from_bytes(cls, raw: bytes) -> "KnowledgeGraph":
+        data = json.loads(raw.decode("utf-8"))
+        return cls(data, version=hashlib.sha256(raw).hexdigest()[:16])
+
+    @staticmethod
+    def _invert(entries: Iterable) -> Dict[str, List[K]]:
+        index: Dict[str, List[K]] = {}
+        for key, skill_set in entries:
+            for skill in skill_set:
+                index.setdefault(skill, []).append(key)
+        return index
+
+    @staticmethod
+    def _overlaps(index: Dict[str, List[K]], skills: Iterable[str]) -> Dict[K, List[str]]:
+        """Map every entry sharing a skill with ``skills`` to the shared skills."""
+        overlaps: Dict[K, List[str]] = {}
+        for skill in skills:
+            for key in index.get(skill, ()):
+                overlaps.setdefault(key, []).append(skill)
+        return overlaps
 
     @staticmethod
     def normalize_skill_display(skills: List[str]) -> List[str]:
@@ -58,42 +109,96 @@ class KnowledgeGraph:
             return []
         return self.roles.get(role_key, [])
 
-    def order_skills_with_prereqs(self, skills: List[str]) -> List[str]:
-        skills_set = set(skills)
-        ordered = []
-        visiting = set()
-        visited = set()
-
-        def visit(skill: str) -> None:
-            if skill in visited:
-                return
-            if skill in visiting:
-                return
-            visiting.add(skill)
-            for prereq in self.prereqs.get(skill, []):
-                if prereq in skills_set:
-                    visit(prereq)
-            visiting.remove(skill)
-            visited.add(skill)
-            ordered.append(skill)
+    def _build_prereq_order(self):
+        """
+        Rank every skill so prerequisites come first and collect transitive prerequisites.
 
+        The rank is the post-order of an iterative depth-first walk that visits
+        skills alphabetically and prerequisites in listed order, which keeps a
+        skill next to the prerequisites it introduces. An edge that closes a
+        cycle is recorded in ``prereq_cycles`` and left out of both structures.
+
+        Returns:
+            Tuple of (skill -> rank, skill -> frozenset of transitive prerequisites)
+        """
+        nodes = set(self.skills) | set(self.prereqs)
+        for prereqs in self.prereqs.values():
+            nodes.update(prereqs)
+        rank: Dict[str, int] = {}
+        closure: Dict[str, FrozenSet[str]] = {}
+        on_path: Dict[str, int] = {}
+        path: List[str] = []
+        for root in sorted(nodes):
+            if root in rank:
+                continue
+            stack = [(root, iter(self.prereqs.get(root, ())))]
+            on_path[root] = 0
+            path.append(root)
+            while stack:
+                skill, pending = stack[-1]
+                prereq = next(pending, None)
+                if prereq is None:
+                    stack.pop()
+                    path.pop()
+                    del on_path[skill]
+                    required = set()
+                    for direct in self.prereqs.get(skill, ()):
+                        if direct in rank:
+                            required.add(direct)
+                            required.update(closure[direct])
+                    closure[skill] = frozenset(required)
+                    rank[skill] = len(rank)
+                elif prereq in on_path:
+                    self.prereq_cycles.append(path[on_path[prereq]:] + [prereq])
+                elif prereq not in rank:
+                    on_path[prereq] = len(path)
+                    path.append(prereq)
+                    stack.append((prereq, iter(self.prereqs.get(prereq, ()))))
+        return rank, closure
+
+    def prerequisites_of(self, skills: Iterable[str]) -> Set[str]:
+        """Transitive prerequisites of ``skills`` that are not in ``skills`` themselves."""
+        skills = set(skills)
+        required: Set[str] = set()
         for skill in skills:
-            visit(skill)
-        return ordered
+            required.update(self.prereq_closure.get(skill, ()))
+        return required - skills
+
+    def order_skills_with_prereqs(
+        self,
+        skills: List[str],
+        expand: bool = False,
+        known: Iterable[str] = ()
+    ) -> List[str]:
+        """
+        Order skills so every prerequisite comes before the skills that need it.
+
+        Args:
+            skills: Canonical skill keys
+            expand: Also add missing transitive prerequisites
+            known: Skills already held, never added by ``expand``
+
+        Returns:
+            Deduplicated skills sorted by prerequisite rank; skills unknown to
+            the graph keep their input order at the end
+        """
+        selected = list(dict.fromkeys(skills))
+        if expand:
+            selected.extend(sorted(self.prerequisites_of(selected) - set(known)))
+        unranked = len(self.prereq_rank)
+        positions = {skill: idx for idx, skill in enumerate(selected)}
+        return sorted(selected, key=lambda skill: self.prereq_rank.get(skill, unranked + positions[skill]))
 
     def recommend_courses(self, skills: List[str], limit: int = 5) -> List[Dict[str, object]]:
-        skills_set = set(skills)
+        overlaps = self._overlaps(self.skill_to_courses, set(skills))
         scored = []
-        for course in self.courses:
-            course_skills = set(course.get("skills", []))
-            overlap = skills_set.intersection(course_skills)
-            if not overlap:
-                continue
-            score = len(overlap) / max(len(course_skills), 1)
-            scored.append((score, course, overlap))
-        scored.sort(key=lambda item: item[0], reverse=True)
+        # Catalog order keeps ties ranked as before
+        for idx in sorted(overlaps):
+            overlap = overlaps[idx]
+            score = len(overlap) / max(len(self.course_skill_sets[idx]), 1)
+            scored.append((score, self.courses[idx], overlap))
         results = []
-        for score, course, overlap in scored[:limit]:
+        for score, course, overlap in heapq.nlargest(limit, scored, key=lambda item: item[0]):
             results.append({
                 "skill": ", ".join(self.normalize_skill_display(sorted(overlap))),
                 "platform": "Curated",
@@ -110,20 +215,16 @@ class KnowledgeGraph:
         target_role: Optional[str] = None,
         limit: int = 5
     ) -> List[Dict[str, object]]:
-        skills_set = set(skills)
-        role_skills = set(self.get_role_skills(target_role or ""))
+        overlaps = self._overlaps(self.skill_to_certs, set(skills))
+        role_overlaps = self._overlaps(self.skill_to_certs, set(self.get_role_skills(target_role or "")))
         scored = []
-        for cert in self.certifications:
-            cert_skills = set(cert.get("skills", []))
-            overlap = skills_set.intersection(cert_skills)
-            role_overlap = role_skills.intersection(cert_skills) if role_skills else set()
-            if not overlap and not role_overlap:
-                continue
-            score = (len(overlap) * 1.5 + len(role_overlap)) / max(len(cert_skills), 1)
-            scored.append((score, cert, overlap, role_overlap))
-        scored.sort(key=lambda item: item[0], reverse=True)
+        for idx in sorted(overlaps.keys() | role_overlaps.keys()):
+            overlap = overlaps.get(idx, [])
+            role_overlap = role_overlaps.get(idx, [])
+            score = (len(overlap) * 1.5 + len(role_overlap)) / max(len(self.cert_skill_sets[idx]), 1)
+            scored.append((score, self.certifications[idx], overlap, role_overlap))
         results = []
-        for score, cert, overlap, role_overlap in scored[:limit]:
+        for score, cert, overlap, role_overlap in heapq.nlargest(limit, scored, key=lambda item: item[0]):
             results.append({
                 "name": cert.get("name", "Certification"),
                 "provider": cert.get("provider", "Provider"),
@@ -141,28 +242,129 @@ class KnowledgeGraph:
         current_role: Optional[str] = None,
         top_k: int = 5
     ) -> List[Dict[str, object]]:
-        skill_set = set(skills)
-        suggestions = []
-        excluded = _canonicalize(current_role) if current_role else None
-        for role_key, role_skills in self.roles.items():
-            if excluded and excluded == role_key:
-                continue
-            role_skill_set = set(role_skills)
-            if not role_skill_set:
-                continue
-            matched = sorted(list(role_skill_set.intersection(skill_set)))
-            missing = sorted(list(role_skill_set.difference(skill_set)))
-            match_pct = round((len(matched) / len(role_skill_set)) * 100, 2)
-            suggestions.append({
-                "role": role_key.replace("_", " ").title(),
-                "match_percentage": match_pct,
-                "matched_skills": self.normalize_skill_display(matched),
-                "missing_skills": self.normalize_skill_display(missing),
-                "reason": f"Matches {len(matched)} of {len(role_skill_set)} core skills."
-            })
-        suggestions.sort(key=lambda s: s["match_percentage"], reverse=True)
-        return suggestions[:top_k]
+        return self.suggest_alternative_roles_batch([skills], [current_role], top_k)[0]
+
+    def suggest_alternative_roles_batch(
+        self,
+        profiles: List[List[str]],
+        current_roles: Optional[List[Optional[str]]] = None,
+        top_k: int = 5
+    ) -> List[List[Dict[str, object]]]:
+        """Score many skill profiles against every role in one sparse product."""
+        current_roles = current_roles or [None] * len(profiles)
+        scores = self.role_scorer.score_batch(profiles)
+        results = []
+        for row, skills, current_role in zip(scores, profiles, current_roles):
+            exclude = None
+            excluded = _canonicalize(current_role) if current_role else None
+            if excluded in self.role_index:
+                exclude = np.zeros(len(row), dtype=bool)
+                exclude[self.role_index[excluded]] = True
+            ranked = self.role_scorer.top_k(row, top_k, exclude)
+            skill_set = set(skills)
+            results.append([
+                self._describe_role(self.role_scorer.role_keys[idx], skill_set)
+                for idx, _ in ranked
+            ])
+        return results
+
+    def _describe_role(self, role_key: str, skill_set: FrozenSet[str]) -> Dict[str, object]:
+        role_skill_set = self.role_skill_sets[role_key]
+        matched = sorted(list(role_skill_set.intersection(skill_set)))
+        missing = sorted(list(role_skill_set.difference(skill_set)))
+        match_pct = round((len(matched) / len(role_skill_set)) * 100, 2)
+        return {
+            "role": role_key.replace("_", " ").title(),
+            "match_percentage": match_pct,
+            "matched_skills": self.normalize_skill_display(matched),
+            "missing_skills": self.normalize_skill_display(missing),
+            "reason": f"Matches {len(matched)} of {len(role_skill_set)} core skills."
+        }
+
+
+class KnowledgeGraphStore:
+    """
+    Process-wide holder of the loaded knowledge graph.
+
+    The graph is parsed once and replaced only when the file on disk changes
+    (mtime first, then content hash). A reload builds a complete new
+    KnowledgeGraph before swapping the reference, so readers always see
+    either the old graph or the new one, never a partial build. A daemon
+    thread polls the file so the check stays out of the request path.
+    """
+
+    def __init__(self, path: str = GRAPH_PATH):
+        self.path = path
+        self._graph: Optional[KnowledgeGraph] = None
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    def get(self) -> KnowledgeGraph:
+        graph = self._graph
+        if graph is None:
+            self.reload()
+            graph = self._graph
+        return graph
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Reload the graph if the file changed.
+
+        Returns:
+            True if a new graph was swapped in
+        """
+        with self._lock:
+            mtime = os.stat(self.path).st_mtime
+            if not force and self._graph is not None and mtime == self._mtime:
+                return False
+            with open(self.path, "rb") as handle:
+                raw = handle.read()
+            version = hashlib.sha256(raw).hexdigest()[:16]
+            self._mtime = mtime
+            if not force and self._graph is not None and version == self._graph.version:
+                return False
+            graph = KnowledgeGraph.from_bytes(raw)
+            self._graph = graph
+        logger.info(f"Knowledge graph loaded (version {graph.version})")
+        for listener in list(self._listeners):
+            try:
+                listener(graph)
+            except Exception as e:
+                logger.error(f"Knowledge graph reload listener failed: {e}")
+        return True
+
+    def on_reload(self, listener) -> None:
+        """Register a callback invoked with the new graph after each reload."""
+        self._listeners.append(listener)
+
+    def start_watching(self, interval: float) -> None:
+        if interval <= 0 or (self._watcher is not None and self._watcher.is_alive()):
+            return
+        self._stop.clear()
+
+        def watch() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.reload()
+                except Exception as e:
+                    # Keep serving the last good graph
+                    logger.error(f"Knowledge graph reload failed: {e}")
+
+        self._watcher = threading.Thread(target=watch, name="knowledge-graph-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+
+graph_store = KnowledgeGraphStore()
 
 
 def get_graph() -> KnowledgeGraph:
-    return KnowledgeGraph.load()
+    return graph_store.get()
@@ -0,0 +1,197 @@
+import asyncio
+import contextvars
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+
+@dataclass
+class PendingRecord:
+    """
+    An ORM object waiting to be written.
+
+    ``links`` maps a foreign-key attribute of ``obj`` to the record whose
+    generated ID it should receive once that record has been inserted.
+    """
+    obj: Any
+    links: Dict[str, "PendingRecord"] = field(default_factory=dict)
+
+
+def record(obj: Any, **links: PendingRecord) -> PendingRecord:
+    return PendingRecord(obj, links)
+
+
+class WriteBehindQueue:
+    """
+    Persists analysis results off the request path.
+
+    Endpoints ``submit`` units of related records and return immediately; a
+    background task collects units until ``max_batch_size`` records are
+    waiting or ``flush_interval`` seconds have passed and writes them in one
+    transaction. Records are inserted level by level so children can pick up
+    the IDs of parents from the same unit. When ``max_pending`` units are
+    queued, ``submit`` waits for room instead of growing memory without bound.
+
+    If a batch fails it is split in half and each half is retried, down to
+    single units, so one bad record only loses its own unit.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        max_batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_pending: int = 10000
+    ):
+        self.session_factory = session_factory
+        self.max_batch_size = max(1, max_batch_size)
+        self.flush_interval = max(0.0, flush_interval)
+        self.max_pending = max(1, max_pending)
+        self.enabled = False
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.batches = 0
+        self.written = 0
+        self.failed = 0
+        self.retried = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        """Accept submissions; until then (or after ``close``) they are dropped."""
+        self.enabled = True
+
+    async def submit(self, *records: PendingRecord) -> None:
+        """
+        Queue one unit of related records for writing.
+
+        Waits only when the queue is full. Never raises.
+        """
+        if not records:
+            return
+        if not self.enabled:
+            self.dropped += len(records)
+            return
+        self._ensure_worker()
+        await self._queue.put(list(records))
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            # A fresh context, so the worker does not keep the first submitter's request state
+            self._worker = contextvars.Context().run(loop.create_task, self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            units = [await self._queue.get()]
+            size = len(units[0])
+            deadline = loop.time() + self.flush_interval
+            while size < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    unit = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                units.append(unit)
+                size += len(unit)
+            try:
+                await self._write(units)
+            finally:
+                for _ in units:
+                    self._queue.task_done()
+
+    @staticmethod
+    def _levels(units: List[List[PendingRecord]]) -> List[List[PendingRecord]]:
+        depth: Dict[int, int] = {}
+
+        def depth_of(rec: PendingRecord) -> int:
+            if id(rec) not in depth:
+                depth[id(rec)] = 1 + max((depth_of(parent) for parent in rec.links.values()), default=-1)
+            return depth[id(rec)]
+
+        levels: List[List[PendingRecord]] = []
+        for unit in units:
+            for rec in unit:
+                level = depth_of(rec)
+                while len(levels) <= level:
+                    levels.append([])
+                levels[level].append(rec)
+        return levels
+
+    async def _write(self, units: List[List[PendingRecord]]) -> None:
+        count = sum(len(unit) for unit in units)
+        error = await self._write_batch(units)
+        if error is None:
+            self.written += count
+            return
+        if len(units) == 1:
+            self.failed += count
+            logger.error(f"Error persisting {count} records, dropping them: {error}")
+            return
+        self.retried += count
+        middle = len(units) // 2
+        await self._write(units[:middle])
+        await self._write(units[middle:])
+
+    async def _write_batch(self, units: List[List[PendingRecord]]) -> Optional[Exception]:
+        """Write units in one transaction; return the error instead of raising."""
+        levels = self._levels(units)
+        async with self.session_factory() as session:
+            try:
+                for level in levels:
+                    for rec in level:
+                        for attr, parent in rec.links.items():
+                            setattr(rec.obj, attr, parent.obj.id)
+                    session.add_all([rec.obj for rec in level])
+                    # Inserts of one table in one level go out as a single executemany
+                    await session.flush()
+                await session.commit()
+                return None
+            except Exception as e:
+                await session.rollback()
+                # Rolled-back objects keep the IDs of their discarded inserts
+                for level in levels:
+                    for rec in level:
+                        rec.obj.id = None
+                return e
+            finally:
+                self.batches += 1
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Stop accepting records and flush what is queued."""
+        self.enabled = False
+        if self._worker is None or self._worker.done():
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Write-behind flush timed out with {self._queue.qsize()} units queued")
+        self._worker.cancel()
+        logger.info(f"Write-behind queue closed: {self.written} records written, {self.failed} failed")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self.batches,
+            "written": self.written,
+            "failed": self.failed,
+            "retried": self.retried,
+            "dropped": self.dropped
+        }
+
+
+# Global write-behind queue for analysis results
+write_behind = WriteBehindQueue(
+    max_batch_size=settings.PERSISTENCE_BATCH_SIZE,
+    flush_interval=settings.PERSISTENCE_FLUSH_SECONDS,
+    max_pending=settings.PERSISTENCE_QUEUE_SIZE
+)
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.services.knowledge_graph import graph_store
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+def make_request_key(endpoint: str, graph_version: str, params: Dict[str, object]) -> str:
+    """
+    Cache key for a recommendation request.
+
+    Args:
+        endpoint: Route the response belongs to
+        graph_version: Version of the knowledge graph the response is computed from
+        params: Canonical request fields; callers sort and normalize them first
+
+    Returns:
+        Hex digest identifying the response
+    """
+    canonical = json.dumps(
+        {"endpoint": endpoint, "graph": graph_version, "params": params},
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header covers ``etag`` (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class ResponseCache:
+    """
+    In-process cache of serialized responses from the recommendation endpoints.
+
+    Those endpoints are pure functions of the canonical request and the
+    knowledge graph, so a hit returns the stored JSON bytes without touching
+    the graph. Entries are evicted least recently used beyond ``max_entries``
+    and expire after ``ttl_seconds``. Keys include the graph version, and the
+    cache is also cleared whenever the graph reloads so stale entries do not
+    hold memory.
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 600):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl_seconds
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= now:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, content: Dict[str, object]) -> CachedResponse:
+        """Serialize a response body, store it and return the cached form."""
+        body = json.dumps(content, separators=(",", ":")).encode("utf-8")
+        entry = CachedResponse(
+            body=body,
+            etag='"' + hashlib.sha256(body).hexdigest()[:32] + '"',
+            expires_at=time.monotonic() + self.ttl if self.ttl > 0 else float("inf")
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def clear(self, *_args) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Global response cache; None when disabled
+response_cache: Optional[ResponseCache] = None
+if settings.RESPONSE_CACHE_SIZE > 0:
+    response_cache = ResponseCache(
+        max_entries=settings.RESPONSE_CACHE_SIZE,
+        ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS
+    )
+    graph_store.on_reload(response_cache.clear)
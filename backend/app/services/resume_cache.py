@@ -0,0 +1,129 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+from loguru import logger
+
+from app.core.config import settings
+from app.services.embedding_service import embedding_service
+from app.services.resume_parser import ResumeParser
+from app.services.skill_extractor import SkillExtractor
+
+
+def current_version() -> str:
+    """Parser, skill taxonomy, embedding model and chunking that produced a result."""
+    return ":".join([
+        ResumeParser.PARSER_VERSION,
+        SkillExtractor.taxonomy_version(),
+        embedding_service.resume_embedding_id
+    ])
+
+
+@dataclass
+class ParsedResume:
+    text: str
+    skills: List[str]
+    embedding: Optional[np.ndarray]
+
+
+class ResumeResultCache:
+    """
+    Persistent cache of parsed resumes keyed by file content hash.
+
+    A hit skips parsing, skill extraction and embedding entirely. Rows are
+    keyed by file hash and by the version string they were computed with, so
+    workers on another parser, taxonomy or model keep their own rows. Only
+    results with an embedding are stored. The SQLite file is opened by
+    ``open()`` (called from the app lifespan); until then every lookup misses.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+    def open(self) -> bool:
+        """
+        Open the SQLite file if it is not open yet.
+
+        Returns:
+            True if the cache is available
+        """
+        with self._lock:
+            if self._conn is not None:
+                return True
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS parsed_resumes ("
+                    " file_hash TEXT NOT NULL,"
+                    " version TEXT NOT NULL,"
+                    " text TEXT NOT NULL,"
+                    " skills TEXT NOT NULL,"
+                    " embedding BLOB NOT NULL,"
+                    " created_at REAL NOT NULL,"
+                    " PRIMARY KEY (file_hash, version))"
+                )
+                conn.commit()
+            except Exception as e:
+                logger.error(f"Resume result cache disabled: {e}")
+                return False
+            self._conn = conn
+            return True
+
+    def close(self) -> None:
+        with self._lock:
+            conn, self._conn = self._conn, None
+        if conn is not None:
+            conn.close()
+
+    def get(self, file_hash: str) -> Optional[ParsedResume]:
+        with self._lock:
+            row = None
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT text, skills, embedding FROM parsed_resumes WHERE file_hash = ? AND version = ?",
+                    (file_hash, current_version())
+                ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        text, skills, blob = row
+        return ParsedResume(
+            text=text, skills=json.loads(skills), embedding=np.frombuffer(blob, dtype=np.float32)
+        )
+
+    def put(self, file_hash: str, result: ParsedResume) -> None:
+        """Store a result; results without an embedding are not cached so a later upload retries it."""
+        if result.embedding is None:
+            return
+        blob = np.asarray(result.embedding, dtype=np.float32).tobytes()
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parsed_resumes"
+                " (file_hash, version, text, skills, embedding, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (file_hash, current_version(), result.text, json.dumps(result.skills), blob, time.time())
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "enabled": self._conn is not None}
+
+
+# Global resume result cache; None when disabled
+resume_cache: Optional[ResumeResultCache] = None
+if settings.RESUME_CACHE_PATH:
+    resume_cache = ResumeResultCache(settings.RESUME_CACHE_PATH)
@@ -1,27 +1,86 @@
 import os
 import fitz  # PyMuPDF
 import pdfplumber
+from concurrent.futures import Executor
 from docx import Document
-from typing import Optional
+from typing import List, Optional, Tuple
 from loguru import logger
+from app.core.config import settings
 
 class ResumeParser:
     """Service for parsing resumes from PDF and DOCX formats."""
     
+    # Bump when extraction or cleaning changes so cached results are recomputed
+    PARSER_VERSION = "2"
+    
+    # Pages with less PyMuPDF text than this are re-read with pdfplumber
+    MIN_PAGE_CHARS = 20
+    
     @staticmethod
-    def extract_text_from_pdf_pymupdf(file_path: str) -> str:
-        """Extract text from PDF using PyMuPDF."""
+    def extract_text_from_pdf_pymupdf(file_path: str, executor: Optional[Executor] = None) -> str:
+        """
+        Extract text from PDF page by page using PyMuPDF.
+        
+        Pages where PyMuPDF finds little or no text fall back to pdfplumber
+        individually. Large documents are split into page ranges that run in
+        parallel on ``executor`` (normally a process pool).
+        
+        Args:
+            file_path: Path to the PDF
+            executor: Optional executor for page-range tasks
+            
+        Returns:
+            Extracted text
+        """
         try:
-            doc = fitz.open(file_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
-            doc.close()
-            return text.strip()
+            with fitz.open(file_path) as doc:
+                page_count = doc.page_count
+            
+            ranges = [(0, page_count)]
+            if executor is not None and page_count >= settings.PDF_PARALLEL_PAGE_THRESHOLD:
+                step = max(1, settings.PDF_PAGES_PER_TASK)
+                ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+            
+            if executor is None:
+                chunks = [ResumeParser._extract_page_range(file_path, start, stop) for start, stop in ranges]
+            else:
+                futures = [
+                    executor.submit(ResumeParser._extract_page_range, file_path, start, stop)
+                    for start, stop in ranges
+                ]
+                chunks = [future.result() for future in futures]
+            
+            return "".join(page for chunk in chunks for page in chunk).strip()
         except Exception as e:
             logger.error(f"Error extracting text from PDF with PyMuPDF: {e}")
             return ""
     
+    @staticmethod
+    def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+        """Extract pages [start, stop), re-reading weak pages with pdfplumber."""
+        with fitz.open(file_path) as doc:
+            pages = [doc.load_page(number).get_text() for number in range(start, stop)]
+        
+        weak = [
+            number for number, text in zip(range(start, stop), pages)
+            if len(text.strip()) < ResumeParser.MIN_PAGE_CHARS
+        ]
+        if weak:
+            for number, text in ResumeParser._extract_pages_pdfplumber(file_path, weak):
+                if len(text.strip()) > len(pages[number - start].strip()):
+                    pages[number - start] = text + "\n"
+        return pages
+    
+    @staticmethod
+    def _extract_pages_pdfplumber(file_path: str, numbers: List[int]) -> List[Tuple[int, str]]:
+        """Extract selected pages with pdfplumber."""
+        try:
+            with pdfplumber.open(file_path) as pdf:
+                return [(number, pdf.pages[number].extract_text() or "") for number in numbers]
+        except Exception as e:
+            logger.error(f"Error extracting pages from PDF with pdfplumber: {e}")
+            return []
+    
     @staticmethod
     def extract_text_from_pdf_pdfplumber(file_path: str) -> str:
         """Extract text from PDF using pdfplumber (fallback method)."""
@@ -51,13 +110,14 @@ class ResumeParser:
             return ""
     
     @staticmethod
-    def parse_resume(file_path: str, filename: str) -> Optional[str]:
+    def parse_resume(file_path: str, filename: str, executor: Optional[Executor] = None) -> Optional[str]:
         """
         Parse resume and extract text.
         
         Args:
             file_path: Path to the resume file
             filename: Name of the file
+            executor: Optional process pool for the actual parsing work
             
         Returns:
             Extracted text or None if extraction failed
@@ -67,16 +127,22 @@ class ResumeParser:
         text = ""
         
         if file_extension == ".pdf":
-            # Try PyMuPDF first
-            text = ResumeParser.extract_text_from_pdf_pymupdf(file_path)
+            # PyMuPDF per page, pdfplumber only for pages it could not read
+            text = ResumeParser.extract_text_from_pdf_pymupdf(file_path, executor)
             
-            # If PyMuPDF fails, try pdfplumber
+            # If PyMuPDF fails on the document as a whole, try pdfplumber
             if not text or len(text) < 50:
                 logger.info("PyMuPDF extraction insufficient, trying pdfplumber...")
-                text = ResumeParser.extract_text_from_pdf_pdfplumber(file_path)
+                if executor is not None:
+                    text = executor.submit(ResumeParser.extract_text_from_pdf_pdfplumber, file_path).result()
+                else:
+                    text = ResumeParser.extract_text_from_pdf_pdfplumber(file_path)
         
         elif file_extension == ".docx":
-            text = ResumeParser.extract_text_from_docx(file_path)
+            if executor is not None:
+                text = executor.submit(ResumeParser.extract_text_from_docx, file_path).result()
+            else:
+                text = ResumeParser.extract_text_from_docx(file_path)
         
         else:
             logger.error(f"Unsupported file format: {file_extension}")
@@ -0,0 +1,95 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+class RoleFitScorer:
+    """
+    Vectorized role-fit scoring over a skill x role incidence matrix.
+
+    Skills get integer IDs and roles are rows of a sparse 0/1 matrix, so the
+    match percentage of every role comes from one sparse mat-vec (or one
+    sparse mat-mat for a batch of skill profiles). Skills outside the role
+    vocabulary cannot match any role and are ignored.
+    """
+
+    def __init__(self, roles: Dict[str, Iterable[str]]):
+        self.role_keys: List[str] = list(roles)
+        role_skill_sets = [set(roles[role_key]) for role_key in self.role_keys]
+        self.skill_ids: Dict[str, int] = {}
+        for skill_set in role_skill_sets:
+            for skill in sorted(skill_set):
+                self.skill_ids.setdefault(skill, len(self.skill_ids))
+
+        rows, cols = [], []
+        for row, skill_set in enumerate(role_skill_sets):
+            for skill in skill_set:
+                rows.append(row)
+                cols.append(self.skill_ids[skill])
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(self.role_keys), len(self.skill_ids))
+        )
+        self.role_sizes = np.array([len(skill_set) for skill_set in role_skill_sets], dtype=np.float64)
+        # Roles without skills can never be suggested
+        self.empty_roles = self.role_sizes == 0
+
+    def _profiles_matrix(self, profiles: Sequence[Iterable[str]]) -> sparse.csc_matrix:
+        rows, cols = [], []
+        for col, skills in enumerate(profiles):
+            ids = {self.skill_ids[skill] for skill in skills if skill in self.skill_ids}
+            rows.extend(ids)
+            cols.extend([col] * len(ids))
+        return sparse.csc_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(self.skill_ids), len(profiles))
+        )
+
+    def score_batch(self, profiles: Sequence[Iterable[str]]) -> np.ndarray:
+        """
+        Match percentage of every role for every profile.
+
+        Returns:
+            Array of shape (len(profiles), n_roles), rounded to 2 decimals
+        """
+        if not self.role_keys:
+            return np.zeros((len(profiles), 0))
+        counts = (self.matrix @ self._profiles_matrix(profiles)).toarray().T
+        sizes = np.where(self.empty_roles, 1.0, self.role_sizes)
+        return np.round(counts / sizes * 100, 2)
+
+    def score(self, skills: Iterable[str]) -> np.ndarray:
+        """Match percentage of every role for one skill profile."""
+        return self.score_batch([skills])[0]
+
+    def top_k(
+        self,
+        scores: np.ndarray,
+        k: int,
+        exclude: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Pick the best roles from one row of scores.
+
+        Ties keep role order. ``exclude`` is a boolean mask of roles to skip.
+
+        Returns:
+            List of (role index, match percentage)
+        """
+        masked = self.empty_roles if exclude is None else (self.empty_roles | exclude)
+        candidates = np.where(masked, -1.0, scores)
+        k = min(k, int((~masked).sum()))
+        if k <= 0:
+            return []
+        if k < len(candidates):
+            kth = np.partition(candidates, len(candidates) - k)[len(candidates) - k]
+            pool = np.flatnonzero(candidates >= kth)
+        else:
+            pool = np.flatnonzero(candidates >= 0)
+        ordered = pool[np.lexsort((pool, -candidates[pool]))][:k]
+        return [(int(idx), float(candidates[idx])) for idx in ordered]
+
+    def exclusion_mask(self, predicate) -> np.ndarray:
+        """Boolean mask of roles whose key satisfies ``predicate``."""
+        return np.array([bool(predicate(role_key)) for role_key in self.role_keys], dtype=bool)
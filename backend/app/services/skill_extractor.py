@@ -1,6 +1,10 @@
+import hashlib
+import json
 import re
 from typing import List, Dict, Set
 from loguru import logger
+from app.services.role_scorer import RoleFitScorer
+from app.services.skill_matcher import SkillMatcher
 
 class SkillExtractor:
     """Service for extracting and normalizing skills from text."""
@@ -159,6 +163,11 @@ class SkillExtractor:
         "kubernetes": "DevOps",
     }
     
+    # Compiled from SKILL_DATABASE / ROLE_SKILL_MAP on first use
+    _matcher = None
+    _role_scorer = None
+    _taxonomy_version = None
+
     @staticmethod
     def extract_skills(text: str) -> List[str]:
         """
@@ -171,17 +180,24 @@ class SkillExtractor:
             List of normalized skill names
         """
         text_lower = text.lower()
-        found_skills = set()
-        
-        # Search for each skill pattern
-        for normalized_skill, patterns in SkillExtractor.SKILL_DATABASE.items():
-            for pattern in patterns:
-                if SkillExtractor._pattern_in_text(pattern, text_lower):
-                    found_skills.add(normalized_skill)
-                    break
-        
+        found_skills = SkillExtractor._get_matcher().match(text_lower)
         return sorted(list(found_skills))
 
+    @classmethod
+    def taxonomy_version(cls) -> str:
+        """Short content hash of SKILL_DATABASE, used to invalidate cached results."""
+        if cls._taxonomy_version is None:
+            encoded = json.dumps(cls.SKILL_DATABASE, sort_keys=True).encode("utf-8")
+            cls._taxonomy_version = hashlib.sha256(encoded).hexdigest()[:16]
+        return cls._taxonomy_version
+
+    @classmethod
+    def _get_matcher(cls) -> SkillMatcher:
+        """Build the single-pass alias matcher once per taxonomy."""
+        if cls._matcher is None:
+            cls._matcher = SkillMatcher(cls.SKILL_DATABASE)
+        return cls._matcher
+
     @staticmethod
     def infer_skills_from_role(text: str) -> List[str]:
         """Infer likely skills based on role keywords in text."""
@@ -202,16 +218,19 @@ class SkillExtractor:
         Suggest alternative roles based on skill overlap.
         Expects skills as canonical keys (e.g., python, react, sql).
         """
+        scorer = SkillExtractor._get_role_scorer()
+        exclude = None
+        if exclude_role:
+            exclude = scorer.exclusion_mask(lambda role: exclude_role.lower() in role)
+        ranked = scorer.top_k(scorer.score(skills), top_k, exclude)
+
         skill_set = set(skills)
         suggestions = []
-        for role, role_skills in SkillExtractor.ROLE_SKILL_MAP.items():
-            if exclude_role and exclude_role.lower() in role:
-                continue
-            role_skill_set = set(role_skills)
+        for idx, _ in ranked:
+            role = scorer.role_keys[idx]
+            role_skill_set = set(SkillExtractor.ROLE_SKILL_MAP[role])
             matched = sorted(list(role_skill_set.intersection(skill_set)))
             missing = sorted(list(role_skill_set.difference(skill_set)))
-            if not role_skill_set:
-                continue
             match_pct = round((len(matched) / len(role_skill_set)) * 100, 2)
             suggestions.append({
                 "role": role.title(),
@@ -220,9 +239,14 @@ class SkillExtractor:
                 "missing_skills": SkillExtractor.normalize_skills(missing),
                 "reason": f"Matches {len(matched)} of {len(role_skill_set)} core skills."
             })
+        return suggestions
 
-        suggestions.sort(key=lambda s: s["match_percentage"], reverse=True)
-        return suggestions[:top_k]
+    @classmethod
+    def _get_role_scorer(cls) -> RoleFitScorer:
+        """Build the role incidence matrix once per ROLE_SKILL_MAP."""
+        if cls._role_scorer is None:
+            cls._role_scorer = RoleFitScorer(cls.ROLE_SKILL_MAP)
+        return cls._role_scorer
 
     @staticmethod
     def _pattern_in_text(pattern: str, text_lower: str) -> bool:
@@ -0,0 +1,79 @@
+import re
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+# Same boundary rules as SkillExtractor._pattern_in_text: an alias must not be
+# glued to a letter or digit on either side, which keeps tokens like c++ / c#.
+_BOUNDARY_BEFORE = r"(?<![a-z0-9])"
+_BOUNDARY_AFTER = r"(?![a-z0-9])"
+_WORD_CHAR = re.compile(r"[a-z0-9]")
+
+
+def _trie_to_regex(node: Dict[str, dict]) -> str:
+    """Render a character trie as a regex that prefers the longest alias."""
+    terminal = "" in node
+    branches = []
+    for char in sorted(key for key in node if key):
+        branches.append(re.escape(char) + _trie_to_regex(node[char]))
+    if not branches:
+        return ""
+    if len(branches) == 1 and not terminal:
+        return branches[0]
+    body = "(?:" + "|".join(branches) + ")"
+    if terminal:
+        # Greedy optional: try the longer alias first, backtrack to this one.
+        body += "?"
+    return body
+
+
+class SkillMatcher:
+    """
+    Match every alias of a skill taxonomy in a single pass over the text.
+
+    The aliases are compiled into one trie-shaped regex wrapped in a zero-width
+    lookahead, so matches may overlap (``next.js`` still yields ``js``). At any
+    start position the regex captures the longest alias; shorter aliases that
+    are prefixes of it and would also satisfy the boundary are precomputed.
+    """
+
+    def __init__(self, skill_database: Dict[str, List[str]]):
+        alias_skills: Dict[str, Set[str]] = {}
+        for skill, aliases in skill_database.items():
+            for alias in aliases:
+                alias = alias.lower()
+                if alias:
+                    alias_skills.setdefault(alias, set()).add(skill)
+
+        self._alias_skills: Dict[str, FrozenSet[str]] = {}
+        for alias in alias_skills:
+            skills = set(alias_skills[alias])
+            for size in range(1, len(alias)):
+                prefix = alias[:size]
+                if prefix in alias_skills and not _WORD_CHAR.match(alias[size]):
+                    skills.update(alias_skills[prefix])
+            self._alias_skills[alias] = frozenset(skills)
+
+        self.pattern = self._compile(self._alias_skills.keys())
+
+    @staticmethod
+    def _compile(aliases: Iterable[str]) -> "re.Pattern[str]":
+        trie: Dict[str, dict] = {}
+        for alias in aliases:
+            node = trie
+            for char in alias:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        if not trie:
+            # Matches nothing.
+            return re.compile(r"(?!)")
+        body = _trie_to_regex(trie)
+        return re.compile(
+            _BOUNDARY_BEFORE + "(?=(" + body + ")" + _BOUNDARY_AFTER + ")"
+        )
+
+    def match(self, text_lower: str) -> Set[str]:
+        """Return the canonical skills found in already lower-cased text."""
+        found: Set[str] = set()
+        alias_skills = self._alias_skills
+        for alias in set(self.pattern.findall(text_lower)):
+            found.update(alias_skills[alias])
+        return found
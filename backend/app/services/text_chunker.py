@@ -0,0 +1,68 @@
+import zlib
+from typing import List
+
+# Words that end a sentence or a bullet are preferred cut points
+SENTENCE_ENDINGS = (".", "!", "?", ";", ":")
+
+
+def split_into_chunks(text: str, max_words: int = 128, overlap_words: int = 24) -> List[str]:
+    """
+    Split text into overlapping word windows with content-defined boundaries.
+
+    A segment is cut after a word that ends a sentence, or where the checksum
+    of that word and the one before it hits a fixed pattern, once it holds at
+    least half of ``max_words``, and always at ``max_words``. Each chunk is
+    one segment prefixed with the last ``overlap_words`` words of the
+    previous segment.
+
+    Because cut points depend on the words around them rather than on
+    absolute positions, editing one part of a resume changes only the
+    chunks near the edit; later chunks come out identical and are served
+    from the embedding cache.
+
+    Args:
+        text: Cleaned text
+        max_words: Upper bound on words per segment, before the overlap
+        overlap_words: Words carried over from the previous segment
+
+    Returns:
+        Chunk strings in document order; a single chunk for short text
+    """
+    words = text.split()
+    max_words = max(1, max_words)
+    if len(words) <= max_words + overlap_words:
+        return [" ".join(words)] if words else []
+
+    min_words = max(1, max_words // 2)
+    # Roughly one checksum cut per max_words words when there is no punctuation
+    divisor = max(1, max_words - min_words)
+    segments: List[List[str]] = []
+    current: List[str] = []
+    previous_word = ""
+    for word in words:
+        current.append(word)
+        pair = f"{previous_word} {word}"
+        previous_word = word
+        if len(current) < min_words:
+            continue
+        if (
+            len(current) >= max_words
+            or word.endswith(SENTENCE_ENDINGS)
+            or zlib.crc32(pair.encode("utf-8")) % divisor == 0
+        ):
+            segments.append(current)
+            current = []
+    if current:
+        # A short tail joins the previous segment when the result still fits
+        if segments and len(current) < min_words and len(segments[-1]) + len(current) <= max_words:
+            segments[-1].extend(current)
+        else:
+            segments.append(current)
+
+    chunks = []
+    previous: List[str] = []
+    for segment in segments:
+        carry = previous[-overlap_words:] if overlap_words > 0 else []
+        chunks.append(" ".join(carry + segment))
+        previous = segment
+    return chunks
@@ -0,0 +1,133 @@
+import hashlib
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict
+
+import aiofiles
+from loguru import logger
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit."""
+
+
+@dataclass
+class StoredUpload:
+    path: str
+    sha256: str
+    size: int
+    deduplicated: bool
+
+
+class UploadStore:
+    """
+    Content-addressed storage for uploaded files.
+
+    Uploads are streamed in chunks into a temporary file while being hashed,
+    and aborted as soon as they pass ``max_size``. The finished file is moved
+    to ``<root>/<hash[:2]>/<hash><ext>``, so identical uploads are stored once
+    and uploads sharing a filename never overwrite each other.
+    """
+
+    TMP_DIR = ".incoming"
+
+    def __init__(self, root: str, max_size: int, chunk_size: int = 1024 * 1024):
+        self.root = root
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+
+    def path_for(self, sha256: str, extension: str) -> str:
+        return os.path.join(self.root, sha256[:2], f"{sha256}{extension}")
+
+    async def save(self, upload, extension: str) -> StoredUpload:
+        """
+        Stream an UploadFile to disk.
+
+        Raises:
+            UploadTooLargeError: if the upload is larger than ``max_size``
+        """
+        tmp_dir = os.path.join(self.root, self.TMP_DIR)
+        os.makedirs(tmp_dir, exist_ok=True)
+        tmp_path = os.path.join(tmp_dir, uuid.uuid4().hex)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with aiofiles.open(tmp_path, "wb") as buffer:
+                while True:
+                    chunk = await upload.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_size:
+                        raise UploadTooLargeError(
+                            f"File exceeds maximum upload size of {self.max_size} bytes"
+                        )
+                    digest.update(chunk)
+                    await buffer.write(chunk)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        sha256 = digest.hexdigest()
+        final_path = self.path_for(sha256, extension)
+        if os.path.exists(final_path):
+            os.remove(tmp_path)
+            # Refresh the timestamp so retention treats it as recently used
+            os.utime(final_path)
+            return StoredUpload(final_path, sha256, size, deduplicated=True)
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(tmp_path, final_path)
+        return StoredUpload(final_path, sha256, size, deduplicated=False)
+
+    def collect_garbage(self, max_age_seconds: float, max_total_bytes: int) -> Dict[str, int]:
+        """
+        Apply the retention policy to the upload directory.
+
+        Files unused for longer than ``max_age_seconds`` are removed, then the
+        least recently used files go until the directory fits in
+        ``max_total_bytes``. Stale temporary files are always removed.
+        """
+        now = time.time()
+        files = []
+        removed = 0
+        freed = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            is_tmp = os.path.basename(dirpath) == self.TMP_DIR
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                age = now - stat.st_mtime
+                # In-flight uploads are young; anything older was abandoned
+                expired = age > max_age_seconds if not is_tmp else age > 3600
+                if expired:
+                    try:
+                        os.remove(path)
+                        removed += 1
+                        freed += stat.st_size
+                    except FileNotFoundError:
+                        pass
+                elif not is_tmp:
+                    files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        if max_total_bytes > 0 and total > max_total_bytes:
+            for _, size, path in sorted(files):
+                if total <= max_total_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    removed += 1
+                    freed += size
+                    total -= size
+                except FileNotFoundError:
+                    pass
+
+        if removed:
+            logger.info(f"Upload GC removed {removed} files ({freed} bytes)")
+        return {"removed": removed, "freed_bytes": freed, "remaining_bytes": total}
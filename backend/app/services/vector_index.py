@@ -0,0 +1,346 @@
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+import faiss
+import numpy as np
+from loguru import logger
+from app.core.config import settings
+
+
+class JobVectorIndex:
+    """
+    Persistent vector index of job-description embeddings.
+
+    Vectors are L2-normalized so inner product equals cosine similarity.
+    ``flat`` mode is an exact inner-product search; ``hnsw`` mode is an
+    approximate graph index. HNSW cannot remove vectors in place, so deletes
+    there are tombstoned, filtered out of results and compacted away when the
+    index is snapshotted. Vectors carry internal IDs mapped back to job IDs.
+
+    On disk each snapshot is a directory ``<path>/<version>/`` holding
+    ``jobs.faiss`` and ``jobs.meta.json``. The ``<path>/CURRENT`` file names
+    the live version and is replaced atomically once both files are written,
+    so a crash mid-snapshot leaves the previous snapshot in place.
+    """
+
+    INDEX_FILE = "jobs.faiss"
+    META_FILE = "jobs.meta.json"
+    CURRENT_FILE = "CURRENT"
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "flat",
+        hnsw_m: int = 32,
+        ef_search: int = 64
+    ):
+        if mode not in ("flat", "hnsw"):
+            raise ValueError(f"Unsupported vector index mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.hnsw_m = hnsw_m
+        self.ef_search = ef_search
+        self.dim: Optional[int] = None
+        self.index = None
+        self.meta: Dict[int, Dict[str, object]] = {}
+        # job ID -> ID of its vector inside the faiss index
+        self._vector_ids: Dict[int, int] = {}
+        self._job_ids: Dict[int, int] = {}
+        self._next_vector_id = 0
+        self.tombstones = set()
+        self.dirty = False
+        self.last_snapshot: Optional[float] = None
+        self._lock = threading.RLock()
+        # Serialize compactions and snapshot writes, which run outside ``_lock``
+        self._compact_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+
+    def _new_index(self, dim: int):
+        if self.mode == "hnsw":
+            base = faiss.IndexHNSWFlat(dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            base.hnsw.efSearch = self.ef_search
+        else:
+            base = faiss.IndexFlatIP(dim)
+        return faiss.IndexIDMap2(base)
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        matrix = np.ascontiguousarray(np.atleast_2d(np.asarray(vectors, dtype=np.float32)))
+        faiss.normalize_L2(matrix)
+        return matrix
+
+    def __len__(self) -> int:
+        return len(self.meta)
+
+    def _snapshot_dir(self) -> str:
+        """Directory of the live snapshot; ``path`` itself for older flat layouts."""
+        try:
+            with open(os.path.join(self.path, self.CURRENT_FILE), "r", encoding="utf-8") as handle:
+                version = handle.read().strip()
+        except FileNotFoundError:
+            return self.path
+        return os.path.join(self.path, version)
+
+    def load(self) -> bool:
+        """Load the last snapshot from disk. Returns False if none exists."""
+        directory = self._snapshot_dir()
+        index_path = os.path.join(directory, self.INDEX_FILE)
+        meta_path = os.path.join(directory, self.META_FILE)
+        if not (os.path.exists(index_path) and os.path.exists(meta_path)):
+            return False
+        with self._lock:
+            with open(meta_path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+            self.index = faiss.read_index(index_path)
+            self.dim = self.index.d
+            self.meta = {int(job_id): item for job_id, item in payload["jobs"].items()}
+            self._vector_ids = {int(job_id): vid for job_id, vid in payload["vector_ids"].items()}
+            self._job_ids = {vid: job_id for job_id, vid in self._vector_ids.items()}
+            self._next_vector_id = payload.get("next_vector_id", 0)
+            self.tombstones = set(payload.get("tombstones", []))
+            if payload.get("mode") != self.mode:
+                logger.warning(
+                    f"Vector index snapshot is '{payload.get('mode')}', configured mode is "
+                    f"'{self.mode}'; rebuilding"
+                )
+                self._rebuild()
+            elif self.mode == "hnsw":
+                faiss.downcast_index(self.index.index).hnsw.efSearch = self.ef_search
+            self.last_snapshot = time.time()
+        logger.info(f"Loaded vector index with {len(self.meta)} jobs from {self.path}")
+        return True
+
+    def add(self, job_ids: List[int], vectors, metadata: Optional[List[Dict[str, object]]] = None) -> None:
+        """Insert or replace jobs by ID."""
+        if not job_ids:
+            return
+        matrix = self._normalize(vectors)
+        with self._lock:
+            if self.index is None:
+                self.dim = matrix.shape[1]
+                self.index = self._new_index(self.dim)
+            elif matrix.shape[1] != self.dim:
+                raise ValueError(f"Expected {self.dim}-dimensional vectors, got {matrix.shape[1]}")
+            replaced = [job_id for job_id in job_ids if job_id in self._vector_ids]
+            if replaced:
+                self._remove(replaced)
+            # Vectors get fresh internal IDs, so a replaced job never collides
+            # with its own tombstone.
+            vector_ids = np.arange(
+                self._next_vector_id, self._next_vector_id + len(job_ids), dtype=np.int64
+            )
+            self._next_vector_id += len(job_ids)
+            self.index.add_with_ids(matrix, vector_ids)
+            for idx, job_id in enumerate(job_ids):
+                self._vector_ids[job_id] = int(vector_ids[idx])
+                self._job_ids[int(vector_ids[idx])] = job_id
+                self.meta[job_id] = metadata[idx] if metadata else {}
+            self.dirty = True
+
+    def delete(self, job_ids: List[int]) -> int:
+        """Remove jobs by ID. Returns how many were present."""
+        with self._lock:
+            present = [job_id for job_id in job_ids if job_id in self._vector_ids]
+            if present:
+                self._remove(present)
+                for job_id in present:
+                    self.meta.pop(job_id, None)
+                self.dirty = True
+            return len(present)
+
+    def _remove(self, job_ids: List[int]) -> None:
+        vector_ids = [self._vector_ids.pop(job_id) for job_id in job_ids]
+        for vector_id in vector_ids:
+            self._job_ids.pop(vector_id, None)
+        if self.mode == "hnsw":
+            self.tombstones.update(vector_ids)
+        else:
+            self.index.remove_ids(np.asarray(vector_ids, dtype=np.int64))
+
+    def search(self, query, top_k: int = 10) -> List[Dict[str, object]]:
+        """
+        Find the jobs most similar to a query embedding.
+
+        Returns:
+            List of dictionaries with job_id, score and stored metadata
+        """
+        return self.search_batch([query], top_k)[0]
+
+    def search_batch(self, queries, top_k: int = 10) -> List[List[Dict[str, object]]]:
+        matrix = self._normalize(queries)
+        with self._lock:
+            if self.index is None or not self.meta:
+                return [[] for _ in range(matrix.shape[0])]
+            # Over-fetch so tombstoned hits do not shrink the result
+            fetch = min(top_k + len(self.tombstones), self.index.ntotal)
+            scores, ids = self.index.search(matrix, fetch)
+            results = []
+            for row_scores, row_ids in zip(scores, ids):
+                hits = []
+                for score, vector_id in zip(row_scores, row_ids):
+                    job_id = self._job_ids.get(int(vector_id))
+                    if job_id is None:
+                        continue
+                    hits.append({"job_id": job_id, "score": float(score), **self.meta[job_id]})
+                    if len(hits) == top_k:
+                        break
+                results.append(hits)
+            return results
+
+    def _reconstruct(self, vector_ids: List[int]) -> np.ndarray:
+        if not vector_ids:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return self.index.reconstruct_batch(np.asarray(vector_ids, dtype=np.int64))
+
+    def _rebuild(self) -> None:
+        job_ids = sorted(self._vector_ids)
+        rebuilt = self._new_index(self.dim)
+        if job_ids:
+            vectors = self._reconstruct([self._vector_ids[job_id] for job_id in job_ids])
+            rebuilt.add_with_ids(vectors, np.arange(len(job_ids), dtype=np.int64))
+        self.index = rebuilt
+        self._vector_ids = {job_id: idx for idx, job_id in enumerate(job_ids)}
+        self._job_ids = dict(enumerate(job_ids))
+        self._next_vector_id = len(job_ids)
+        self.tombstones = set()
+        self.dirty = True
+
+    def compact(self) -> None:
+        """
+        Rebuild the index without tombstoned vectors.
+
+        The live vectors are copied under the lock, the new index is built
+        without it so searches and writes carry on, and jobs added or removed
+        in the meantime are applied to the new index before it is swapped in.
+        """
+        with self._compact_lock:
+            with self._lock:
+                if not self.tombstones or self.index is None:
+                    return
+                source = self.index
+                copied = dict(self._vector_ids)
+                job_ids = sorted(copied)
+                vectors = self._reconstruct([copied[job_id] for job_id in job_ids])
+
+            rebuilt = self._new_index(vectors.shape[1])
+            if job_ids:
+                rebuilt.add_with_ids(vectors, np.arange(len(job_ids), dtype=np.int64))
+
+            with self._lock:
+                if self.index is not source:
+                    # Replaced by load() while building; the next snapshot compacts again
+                    return
+                # Apply writes made while the new index was built
+                vector_ids = {}
+                stale = []
+                for idx, job_id in enumerate(job_ids):
+                    if self._vector_ids.get(job_id) == copied[job_id]:
+                        vector_ids[job_id] = idx
+                    else:
+                        stale.append(idx)
+                added = [job_id for job_id in self._vector_ids if job_id not in vector_ids]
+                next_vector_id = len(job_ids)
+                if added:
+                    new_ids = np.arange(next_vector_id, next_vector_id + len(added), dtype=np.int64)
+                    rebuilt.add_with_ids(
+                        self._reconstruct([self._vector_ids[job_id] for job_id in added]), new_ids
+                    )
+                    vector_ids.update(zip(added, (int(vid) for vid in new_ids)))
+                    next_vector_id += len(added)
+                tombstones = set()
+                if stale:
+                    if self.mode == "hnsw":
+                        tombstones.update(stale)
+                    else:
+                        rebuilt.remove_ids(np.asarray(stale, dtype=np.int64))
+                self.index = rebuilt
+                self._vector_ids = vector_ids
+                self._job_ids = {vid: job_id for job_id, vid in vector_ids.items()}
+                self._next_vector_id = next_vector_id
+                self.tombstones = tombstones
+                self.dirty = True
+
+    def snapshot(self, force: bool = False) -> bool:
+        """
+        Write the index to disk if it changed. Returns True if written.
+
+        The index is serialized to memory and the metadata copied under the
+        lock; the files are written without it, so searches and adds only
+        wait for the in-memory copy.
+        """
+        self.compact()
+        with self._snapshot_lock:
+            with self._lock:
+                if self.index is None or not (self.dirty or force):
+                    return False
+                serialized = faiss.serialize_index(self.index)
+                payload = {
+                    "mode": self.mode,
+                    "dim": self.dim,
+                    "jobs": dict(self.meta),
+                    "vector_ids": dict(self._vector_ids),
+                    "next_vector_id": self._next_vector_id,
+                    "tombstones": sorted(self.tombstones)
+                }
+                # Writes from here on mark the index dirty again
+                self.dirty = False
+
+            try:
+                version = f"v{time.time_ns()}"
+                directory = os.path.join(self.path, version)
+                os.makedirs(directory, exist_ok=True)
+                with open(os.path.join(directory, self.INDEX_FILE), "wb") as handle:
+                    handle.write(serialized.tobytes())
+                payload["jobs"] = {str(job_id): item for job_id, item in payload["jobs"].items()}
+                payload["vector_ids"] = {str(job_id): vid for job_id, vid in payload["vector_ids"].items()}
+                with open(os.path.join(directory, self.META_FILE), "w", encoding="utf-8") as handle:
+                    json.dump(payload, handle)
+                current = os.path.join(self.path, self.CURRENT_FILE)
+                with open(current + ".tmp", "w", encoding="utf-8") as handle:
+                    handle.write(version)
+                os.replace(current + ".tmp", current)
+            except Exception:
+                with self._lock:
+                    self.dirty = True
+                raise
+            self._remove_old_snapshots(keep={version})
+            self.last_snapshot = time.time()
+        logger.info(f"Vector index snapshot written: {len(payload['jobs'])} jobs")
+        return True
+
+    def _remove_old_snapshots(self, keep: Set[str], retain: int = 1) -> None:
+        """Delete superseded snapshot directories, keeping the ``retain`` newest besides ``keep``."""
+        versions = sorted(
+            (entry.name for entry in os.scandir(self.path)
+             if entry.is_dir() and entry.name.startswith("v") and entry.name not in keep),
+            reverse=True
+        )
+        # The previous version stays briefly for workers still loading it
+        for name in versions[retain:]:
+            try:
+                shutil.rmtree(os.path.join(self.path, name))
+            except OSError as e:
+                logger.error(f"Error removing old vector index snapshot {name}: {e}")
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "mode": self.mode,
+            "jobs": len(self.meta),
+            "dim": self.dim,
+            "tombstones": len(self.tombstones),
+            "dirty": self.dirty,
+            "last_snapshot": self.last_snapshot
+        }
+
+
+# Global job index instance; loaded from disk at application startup
+job_index = JobVectorIndex(
+    settings.FAISS_INDEX_PATH,
+    mode=settings.VECTOR_INDEX_MODE,
+    hnsw_m=settings.VECTOR_INDEX_HNSW_M,
+    ef_search=settings.VECTOR_INDEX_EF_SEARCH
+)
@@ -0,0 +1 @@
+"""Reproducible micro-benchmarks; run with ``python -m benchmarks.run``."""
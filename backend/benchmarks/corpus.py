@@ -0,0 +1,106 @@
+"""
+Deterministic synthetic inputs for the benchmarks.
+
+Everything is derived from a seeded ``random.Random`` and the skill taxonomy
+shipped in the repo, so two runs with the same seed see byte-identical
+inputs and no network or external data is needed.
+"""
+import random
+from typing import Dict, List
+
+from app.services.skill_extractor import SkillExtractor
+
+FILLER = (
+    "responsible for designing building and operating services used by millions of customers "
+    "worked closely with product design and data teams to deliver features on schedule "
+    "improved reliability latency and cost of the platform through careful measurement "
+    "mentored engineers reviewed code and wrote documentation for internal tooling "
+    "led migrations owned incident response and drove quarterly planning for the team"
+).split()
+
+
+class SyntheticCorpus:
+    """Seeded generator of resumes, job descriptions, skill sets and graphs."""
+
+    def __init__(self, seed: int = 1234):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.aliases = sorted({alias for names in SkillExtractor.SKILL_DATABASE.values() for alias in names})
+        self.skills = sorted(SkillExtractor.SKILL_DATABASE)
+
+    def text(self, words: int, skill_ratio: float = 0.08) -> str:
+        """Prose of roughly ``words`` words with skill aliases sprinkled in."""
+        out = []
+        for _ in range(words):
+            if self.rng.random() < skill_ratio:
+                out.append(self.rng.choice(self.aliases))
+            else:
+                out.append(self.rng.choice(FILLER))
+            if self.rng.random() < 0.07:
+                out[-1] += "."
+        return " ".join(out)
+
+    def texts(self, count: int, words: int) -> List[str]:
+        return [self.text(words) for _ in range(count)]
+
+    def skill_set(self, size: int, prefix: str = "skill") -> List[str]:
+        """Real taxonomy skills first, then made-up ones once those run out."""
+        real = self.rng.sample(self.skills, min(size, len(self.skills)))
+        extra = [f"{prefix}_{idx}" for idx in range(size - len(real))]
+        return real + extra
+
+    def graph(
+        self,
+        roles: int = 200,
+        skills: int = 2000,
+        courses: int = 5000,
+        certifications: int = 1000,
+        prereq_ratio: float = 0.3
+    ) -> Dict[str, object]:
+        """A knowledge graph shaped like ``app/data/knowledge_graph.json``."""
+        names = [f"skill_{idx}" for idx in range(skills)]
+        # Prerequisites only point at lower-numbered skills, so the graph is acyclic
+        prereqs = {}
+        for idx in range(1, skills):
+            if self.rng.random() < prereq_ratio:
+                prereqs[names[idx]] = self.rng.sample(names[:idx], min(idx, self.rng.randint(1, 3)))
+        return {
+            "skills": names,
+            "roles": {
+                f"role_{idx}": self.rng.sample(names, self.rng.randint(5, 25)) for idx in range(roles)
+            },
+            "courses": [
+                {"name": f"Course {idx}", "skills": self.rng.sample(names, self.rng.randint(1, 5))}
+                for idx in range(courses)
+            ],
+            "certifications": [
+                {
+                    "name": f"Certification {idx}",
+                    "provider": "Synthetic",
+                    "skills": self.rng.sample(names, self.rng.randint(1, 6)),
+                    "roi_score": self.rng.randint(50, 99)
+                }
+                for idx in range(certifications)
+            ],
+            "prereqs": prereqs
+        }
+
+    def write_pdf(self, path: str, pages: int, words_per_page: int = 350) -> str:
+        import fitz
+
+        document = fitz.open()
+        for _ in range(pages):
+            page = document.new_page()
+            page.insert_textbox(page.rect + (54, 54, -54, -54), self.text(words_per_page), fontsize=9)
+        document.save(path)
+        document.close()
+        return path
+
+    def write_docx(self, path: str, paragraphs: int, words_per_paragraph: int = 60) -> str:
+        from docx import Document
+
+        document = Document()
+        for _ in range(paragraphs):
+            document.add_paragraph(self.text(words_per_paragraph))
+        document.save(path)
+        return path
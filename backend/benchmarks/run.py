@@ -0,0 +1,401 @@
+"""
+Micro-benchmarks for the scoring hot paths.
+
+Each benchmark times one call on deterministic synthetic input (see
+``benchmarks.corpus``), picking a loop count that runs for at least
+``--min-time`` seconds and repeating that ``--repeats`` times. Results are
+written as JSON together with the commit and environment they were measured
+on, and ``--compare`` reports the change against an earlier results file.
+
+Usage (from the backend directory):
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --filter skill_extractor --compare bench.json
+"""
+import os
+
+# Benchmarks measure the code, not the on-disk caches
+os.environ.setdefault("EMBEDDING_CACHE_PATH", "")
+os.environ.setdefault("RESUME_CACHE_PATH", "")
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from benchmarks.corpus import SyntheticCorpus
+
+
+@dataclass
+class Benchmark:
+    name: str
+    # Runs once, untimed, and returns the zero-argument callable to time
+    setup: Callable[["BenchContext"], Callable[[], object]]
+
+
+class SkipBenchmark(Exception):
+    """Raised by a setup function when its dependency is unavailable."""
+
+
+class BenchContext:
+    """Shared state for benchmark setup: corpus, scratch directory, pools."""
+
+    def __init__(self, seed: int, workdir: str):
+        self.corpus = SyntheticCorpus(seed)
+        self.seed = seed
+        self.workdir = workdir
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._graph = None
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.workdir, name)
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=2)
+        return self._process_pool
+
+    @property
+    def graph(self):
+        if self._graph is None:
+            from app.services.knowledge_graph import KnowledgeGraph
+            self._graph = KnowledgeGraph(SyntheticCorpus(self.seed).graph())
+        return self._graph
+
+    def close(self) -> None:
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS.append(Benchmark(name, setup))
+        return setup
+    return register
+
+
+# Skill extraction
+
+def _extract(words: int):
+    def setup(ctx: BenchContext):
+        from app.services.skill_extractor import SkillExtractor
+        text = ctx.corpus.text(words)
+        SkillExtractor.extract_skills("warm up the matcher")
+        return lambda: SkillExtractor.extract_skills(text)
+    return setup
+
+benchmark("skill_extractor.extract_skills.short")(_extract(20))
+benchmark("skill_extractor.extract_skills.typical")(_extract(600))
+benchmark("skill_extractor.extract_skills.huge")(_extract(100_000))
+
+
+# Resume parsing
+
+def _parse_pdf(pages: int, parallel: bool = False):
+    def setup(ctx: BenchContext):
+        from app.services.resume_parser import ResumeParser
+        path = ctx.corpus.write_pdf(ctx.path(f"resume_{pages}.pdf"), pages)
+        executor = ctx.process_pool if parallel else None
+        return lambda: ResumeParser.parse_resume(path, "resume.pdf", executor)
+    return setup
+
+benchmark("resume_parser.pdf.1_page")(_parse_pdf(1))
+benchmark("resume_parser.pdf.10_pages")(_parse_pdf(10))
+benchmark("resume_parser.pdf.40_pages")(_parse_pdf(40))
+benchmark("resume_parser.pdf.40_pages.process_pool")(_parse_pdf(40, parallel=True))
+
+
+@benchmark("resume_parser.docx.100_paragraphs")
+def _parse_docx(ctx: BenchContext):
+    from app.services.resume_parser import ResumeParser
+    path = ctx.corpus.write_docx(ctx.path("resume.docx"), 100)
+    return lambda: ResumeParser.parse_resume(path, "resume.docx")
+
+
+@benchmark("resume_parser.clean_text.typical")
+def _clean_text(ctx: BenchContext):
+    from app.services.resume_parser import ResumeParser
+    text = "\n\n".join(ctx.corpus.texts(20, 60))
+    return lambda: ResumeParser.clean_text(text)
+
+
+# Embeddings
+
+def _embedding_service():
+    from app.services.embedding_service import embedding_service
+    if not embedding_service.load():
+        raise SkipBenchmark(f"embedding model unavailable: {embedding_service.load_error}")
+    return embedding_service
+
+
+@benchmark("embedding.single.cold")
+def _embed_single_cold(ctx: BenchContext):
+    service = _embedding_service()
+    text = ctx.corpus.text(300)
+
+    def run():
+        service.cache.invalidate()
+        return service.generate_embedding(text)
+    return run
+
+
+@benchmark("embedding.single.cached")
+def _embed_single_cached(ctx: BenchContext):
+    service = _embedding_service()
+    text = ctx.corpus.text(300)
+    service.generate_embedding(text)
+    return lambda: service.generate_embedding(text)
+
+
+@benchmark("embedding.batch_32.cold")
+def _embed_batch_cold(ctx: BenchContext):
+    service = _embedding_service()
+    texts = ctx.corpus.texts(32, 300)
+
+    def run():
+        service.cache.invalidate()
+        return service.generate_embeddings_batch(texts)
+    return run
+
+
+@benchmark("embedding.resume_chunks.after_edit")
+def _embed_chunks_after_edit(ctx: BenchContext):
+    service = _embedding_service()
+    service.chunking = "mean"
+    words = ctx.corpus.text(1500).split()
+    service.generate_resume_embedding(" ".join(words))
+    edits = iter(range(10 ** 9))
+
+    def run():
+        # One changed word in the middle: only the chunks around it miss the cache
+        edited = list(words)
+        edited[len(words) // 2] = f"edit{next(edits)}"
+        return service.generate_resume_embedding(" ".join(edited))
+    return run
+
+
+@benchmark("embedding.compute_similarities.10000")
+def _similarities(ctx: BenchContext):
+    from app.core.vectors import l2_normalize
+    from app.services.embedding_service import embedding_service
+    rng = np.random.default_rng(ctx.seed)
+    query = l2_normalize(rng.standard_normal(384))
+    candidates = l2_normalize(rng.standard_normal((10_000, 384)))
+    return lambda: embedding_service.compute_similarities(query, candidates)
+
+
+# Knowledge graph
+
+@benchmark("knowledge_graph.build")
+def _graph_build(ctx: BenchContext):
+    from app.services.knowledge_graph import KnowledgeGraph
+    data = SyntheticCorpus(ctx.seed).graph()
+    return lambda: KnowledgeGraph(data)
+
+
+def _graph_profile(ctx: BenchContext, size: int = 40) -> List[str]:
+    return ctx.corpus.rng.sample(sorted(ctx.graph.skills), size)
+
+
+@benchmark("knowledge_graph.recommend_courses")
+def _recommend_courses(ctx: BenchContext):
+    graph, skills = ctx.graph, _graph_profile(ctx)
+    return lambda: graph.recommend_courses(skills, limit=5)
+
+
+@benchmark("knowledge_graph.recommend_certifications")
+def _recommend_certifications(ctx: BenchContext):
+    graph, skills = ctx.graph, _graph_profile(ctx)
+    return lambda: graph.recommend_certifications(skills, target_role="role_7", limit=5)
+
+
+@benchmark("knowledge_graph.suggest_alternative_roles")
+def _alternative_roles(ctx: BenchContext):
+    graph, skills = ctx.graph, _graph_profile(ctx)
+    return lambda: graph.suggest_alternative_roles(skills, current_role="role_3", top_k=5)
+
+
+@benchmark("knowledge_graph.suggest_alternative_roles_batch.100")
+def _alternative_roles_batch(ctx: BenchContext):
+    graph = ctx.graph
+    profiles = [_graph_profile(ctx) for _ in range(100)]
+    return lambda: graph.suggest_alternative_roles_batch(profiles, top_k=5)
+
+
+@benchmark("knowledge_graph.order_skills_with_prereqs")
+def _order_skills(ctx: BenchContext):
+    graph, skills = ctx.graph, _graph_profile(ctx, 300)
+    return lambda: graph.order_skills_with_prereqs(skills)
+
+
+@benchmark("knowledge_graph.order_skills_with_prereqs.expand")
+def _order_skills_expand(ctx: BenchContext):
+    graph, skills = ctx.graph, _graph_profile(ctx, 300)
+    return lambda: graph.order_skills_with_prereqs(skills, expand=True)
+
+
+# Skill gap analysis
+
+@benchmark("skill_gap.analyze_skill_gap.large")
+def _gap_large(ctx: BenchContext):
+    from app.services.skill_gap_service import SkillGapService
+    resume_skills = ctx.corpus.skill_set(2000, "resume")
+    job_skills = ctx.corpus.skill_set(500, "job")
+    return lambda: SkillGapService.analyze_skill_gap(resume_skills, job_skills)
+
+
+@benchmark("skill_gap.generate_skill_heatmap_data.large")
+def _heatmap_large(ctx: BenchContext):
+    from app.services.skill_gap_service import SkillGapService
+    resume_skills = ctx.corpus.skill_set(2000, "resume")
+    job_skills = ctx.corpus.skill_set(500, "job")
+    return lambda: SkillGapService.generate_skill_heatmap_data(resume_skills, job_skills)
+
+
+@benchmark("skill_gap.calculate_match_score")
+def _match_score(ctx: BenchContext):
+    from app.services.skill_gap_service import SkillGapService
+    return lambda: SkillGapService.calculate_match_score(0.73, 61.5)
+
+
+def measure(func: Callable[[], object], min_time: float, repeats: int) -> Dict[str, object]:
+    """timeit-style: find a loop count that takes ``min_time``, then repeat it."""
+    func()
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9) * 1.1))
+    samples = [elapsed / loops]
+    for _ in range(repeats - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - started) / loops)
+    return {
+        "loops": loops,
+        "repeats": repeats,
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "ops_per_s": round(1 / statistics.median(samples), 2)
+    }
+
+
+def environment() -> Dict[str, object]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    }
+
+
+def compare(current: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """Print the change of each median and return the names that regressed."""
+    regressions = []
+    print(f"\n{'benchmark':<55} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, result in current.items():
+        before = baseline.get(name)
+        if not before or "median_s" not in before or "median_s" not in result:
+            continue
+        ratio = result["median_s"] / before["median_s"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<55} {before['median_s'] * 1e3:>10.3f}ms {result['median_s'] * 1e3:>10.3f}ms"
+            f" {(ratio - 1) * 100:>+8.1f}%{flag}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filter", action="append", default=[], help="Only run benchmarks containing this text")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per repeat")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", "-o", help="Write results as JSON")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Relative slowdown of the median counted as a regression")
+    parser.add_argument("--list", action="store_true", help="List benchmark names and exit")
+    args = parser.parse_args()
+
+    selected = [b for b in BENCHMARKS if not args.filter or any(f in b.name for f in args.filter)]
+    if args.list:
+        print("\n".join(b.name for b in selected))
+        return
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory(prefix="cpo-bench-") as workdir:
+        ctx = BenchContext(args.seed, workdir)
+        try:
+            for bench in selected:
+                # Each benchmark gets the same corpus regardless of which ran before it
+                ctx.corpus = SyntheticCorpus(args.seed)
+                try:
+                    func = bench.setup(ctx)
+                    results[bench.name] = measure(func, args.min_time, args.repeats)
+                    print(
+                        f"{bench.name:<55} {results[bench.name]['median_s'] * 1e3:>10.3f}ms"
+                        f" ({results[bench.name]['loops']} loops)"
+                    )
+                except SkipBenchmark as e:
+                    results[bench.name] = {"skipped": str(e)}
+                    print(f"{bench.name:<55} skipped: {e}")
+        finally:
+            ctx.close()
+
+    report = {
+        "environment": environment(),
+        "settings": {"seed": args.seed, "min_time": args.min_time, "repeats": args.repeats},
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
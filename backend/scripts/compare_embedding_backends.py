@@ -0,0 +1,134 @@
+"""
+Compare embedding backends against the reference PyTorch model.
+
+Reports throughput and cosine drift (how far each backend's vectors are from
+the reference vectors for the same text) so a faster backend can be picked
+with a known accuracy cost.
+
+Usage (from the backend directory):
+    python -m scripts.compare_embedding_backends --backends torch onnx onnx-int8
+    python -m scripts.compare_embedding_backends --input texts.txt --json results.json
+"""
+import argparse
+import json
+import random
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.embedding_backends import BACKENDS, create_backend
+from app.services.skill_extractor import SkillExtractor
+
+FILLER = [
+    "Experienced engineer", "responsible for", "designed and shipped", "worked with",
+    "led a team using", "built services on", "improved performance of", "maintained",
+    "collaborated with product on", "migrated the platform to"
+]
+
+
+def synthetic_texts(count: int, seed: int = 0) -> List[str]:
+    """Resume- and job-like sentences built from the skill taxonomy."""
+    rng = random.Random(seed)
+    aliases = sorted({alias for names in SkillExtractor.SKILL_DATABASE.values() for alias in names})
+    texts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(2, 12)):
+            parts.append(rng.choice(FILLER))
+            parts.append(", ".join(rng.sample(aliases, rng.randint(1, 4))))
+        texts.append(" ".join(parts) + ".")
+    return texts
+
+
+def encode_all(backend, texts: List[str], batch_size: int) -> np.ndarray:
+    return np.vstack([
+        backend.encode(texts[start:start + batch_size])
+        for start in range(0, len(texts), batch_size)
+    ])
+
+
+def measure(backend, texts: List[str], batch_size: int, repeats: int) -> Dict:
+    # One untimed pass so session setup and allocator warmup are not counted
+    encode_all(backend, texts[:batch_size], batch_size)
+    timings = []
+    embeddings = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        embeddings = encode_all(backend, texts, batch_size)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {
+        "embeddings": embeddings,
+        "seconds": round(best, 4),
+        "texts_per_second": round(len(texts) / best, 1)
+    }
+
+
+def cosine_drift(reference: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+    ref = reference / np.maximum(np.linalg.norm(reference, axis=1, keepdims=True), 1e-12)
+    cand = candidate / np.maximum(np.linalg.norm(candidate, axis=1, keepdims=True), 1e-12)
+    cosines = (ref * cand).sum(axis=1)
+    return {
+        "mean_cosine": round(float(cosines.mean()), 6),
+        "min_cosine": round(float(cosines.min()), 6),
+        "p01_cosine": round(float(np.percentile(cosines, 1)), 6)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL)
+    parser.add_argument("--input", help="File with one text per line (default: synthetic corpus)")
+    parser.add_argument("--count", type=int, default=512, help="Synthetic texts to generate")
+    parser.add_argument("--batch-size", type=int, default=settings.EMBEDDING_BATCH_MAX_SIZE)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=settings.EMBEDDING_ONNX_THREADS,
+                        help="ONNX Runtime intra-op threads (0 = runtime default)")
+    parser.add_argument("--json", dest="json_path", help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    else:
+        texts = synthetic_texts(args.count)
+
+    # The reference model always runs so drift has something to compare with
+    names = ["torch"] + [name for name in args.backends if name != "torch"]
+    results = []
+    reference = None
+    for name in names:
+        backend = create_backend(
+            name, args.model, export_dir=settings.EMBEDDING_ONNX_DIR, intra_op_threads=args.threads
+        )
+        run = measure(backend, texts, args.batch_size, args.repeats)
+        embeddings = run.pop("embeddings")
+        if reference is None:
+            reference = embeddings
+        results.append({"backend": name, **run, **cosine_drift(reference, embeddings)})
+
+    baseline = results[0]["texts_per_second"]
+    print(f"{len(texts)} texts, batch size {args.batch_size}, model {args.model}")
+    print(f"{'backend':<10} {'texts/s':>10} {'speedup':>8} {'mean cos':>9} {'min cos':>9} {'p01 cos':>9}")
+    for row in results:
+        row["speedup"] = round(row["texts_per_second"] / baseline, 2)
+        print(
+            f"{row['backend']:<10} {row['texts_per_second']:>10.1f} {row['speedup']:>7.2f}x"
+            f" {row['mean_cosine']:>9.4f} {row['min_cosine']:>9.4f} {row['p01_cosine']:>9.4f}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({
+                "model": args.model,
+                "texts": len(texts),
+                "batch_size": args.batch_size,
+                "results": results
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Bulk-ingest job descriptions from an NDJSON feed.
+
+Each line is a JSON object with ``title``, ``description`` and an integer
+``job_id`` (optional with --no-index). Jobs are written to the database and
+the vector index in chunks; rerunning with the same checkpoint file resumes
+after the last committed chunk.
+
+Usage (from the backend directory):
+    python -m scripts.ingest_jobs feed.ndjson
+    python -m scripts.ingest_jobs feed.ndjson.gz --checkpoint ./cache/ingest/feed.json --no-index
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+from typing import AsyncIterator
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.database import Base, SessionLocal, engine
+from app.core.executor import execution
+from app.services.embedding_service import embedding_service
+from app.services.job_ingest import IngestCheckpoint, JobIngestor
+from app.services.vector_index import job_index
+
+
+async def read_lines(path: str) -> AsyncIterator[str]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            yield line
+            # Let chunk processing run between reads
+            await asyncio.sleep(0)
+
+
+async def ingest(args: argparse.Namespace) -> dict:
+    session_factory = None
+    if not args.no_db:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = SessionLocal
+    index = None
+    if not args.no_index:
+        await execution.run_in_thread(job_index.load)
+        embedding_service.cache.open_disk()
+        index = job_index
+
+    checkpoint_path = args.checkpoint or os.path.join(
+        settings.INGEST_CHECKPOINT_DIR, os.path.basename(args.feed) + ".json"
+    )
+    checkpoint = IngestCheckpoint(None if args.restart else checkpoint_path)
+    checkpoint.path = checkpoint_path
+    if checkpoint.offset:
+        logger.info(
+            f"Resuming after line {checkpoint.indexed_offset} "
+            f"(stored up to line {checkpoint.offset})"
+        )
+
+    ingestor = JobIngestor(
+        session_factory=session_factory,
+        index=index,
+        chunk_size=args.chunk_size,
+        checkpoint=checkpoint,
+        snapshot_every=settings.INGEST_SNAPSHOT_CHUNKS
+    )
+    try:
+        stats = await ingestor.run(read_lines(args.feed))
+    finally:
+        await engine.dispose()
+        execution.shutdown()
+    return stats.as_dict()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("feed", help="NDJSON file, optionally gzip-compressed")
+    parser.add_argument("--chunk-size", type=int, default=settings.INGEST_CHUNK_SIZE)
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: INGEST_CHECKPOINT_DIR/<feed>.json)")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    parser.add_argument("--no-db", action="store_true", help="Do not write to the database")
+    parser.add_argument("--no-index", action="store_true", help="Do not update the vector index")
+    args = parser.parse_args()
+
+    summary = asyncio.run(ingest(args))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+Score a folder of resumes against one job description.
+
+Resumes are parsed and their skills extracted in a process pool, embedded in
+batches and scored the same way as /api/match/calculate. Results stream to a
+CSV or Parquet file as they complete; a file that cannot be parsed becomes an
+error row instead of stopping the run. A throughput and latency summary is
+printed at the end.
+
+Usage (from the backend directory):
+    python -m scripts.score_resumes ./resumes --job-file job.txt --job-title "Backend Engineer" -o scores.csv
+    python -m scripts.score_resumes ./resumes --job-description "Python, AWS, Docker" -o scores.parquet --workers 8
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.embedding_service import embedding_service
+from app.services.resume_parser import ResumeParser
+from app.services.skill_extractor import SkillExtractor
+from app.services.skill_gap_service import SkillGapService
+
+FIELDS = [
+    "file", "status", "error", "match_score", "semantic_similarity", "skill_match_percentage",
+    "skills_matched", "total_required_skills", "missing_skills", "skills", "text_length", "parse_seconds"
+]
+
+
+def find_resumes(folder: str, recursive: bool) -> Iterator[str]:
+    """Resume files under ``folder`` in a stable order, listed lazily."""
+    for dirpath, dirnames, filenames in os.walk(folder):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if os.path.splitext(name)[1].lower() in settings.ALLOWED_EXTENSIONS:
+                yield os.path.join(dirpath, name)
+        if not recursive:
+            break
+
+
+def parse_file(path: str) -> Dict[str, object]:
+    """Parse one resume and extract its skills; runs in a worker process."""
+    started = time.perf_counter()
+    try:
+        text = ResumeParser.parse_resume(path, os.path.basename(path))
+        if not text:
+            raise ValueError("no extractable text")
+        text = ResumeParser.clean_text(text)
+        return {
+            "file": path,
+            "text": text,
+            "skills": SkillExtractor.extract_skills(text),
+            "parse_seconds": time.perf_counter() - started
+        }
+    except Exception as e:
+        return {"file": path, "error": f"{type(e).__name__}: {e}", "parse_seconds": time.perf_counter() - started}
+
+
+class ResultWriter:
+    """Streams result rows to CSV, or to Parquet one row group per batch."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.parquet = path.endswith(".parquet")
+        self._writer = None
+        if self.parquet:
+            # Optional dependency, only needed for Parquet output
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            self._pa = pa
+            self._schema = pa.schema([
+                ("file", pa.string()), ("status", pa.string()), ("error", pa.string()),
+                ("match_score", pa.float64()), ("semantic_similarity", pa.float64()),
+                ("skill_match_percentage", pa.float64()), ("skills_matched", pa.int64()),
+                ("total_required_skills", pa.int64()), ("missing_skills", pa.string()),
+                ("skills", pa.string()), ("text_length", pa.int64()), ("parse_seconds", pa.float64())
+            ])
+            self._writer = pq.ParquetWriter(path, self._schema)
+        else:
+            self._handle = open(path, "w", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._handle, fieldnames=FIELDS)
+            self._writer.writeheader()
+
+    def write(self, rows: List[Dict[str, object]]) -> None:
+        if not rows:
+            return
+        if self.parquet:
+            columns = {name: [row.get(name) for row in rows] for name in FIELDS}
+            self._writer.write_table(self._pa.table(columns, schema=self._schema))
+        else:
+            self._writer.writerows(rows)
+            self._handle.flush()
+
+    def close(self) -> None:
+        if self.parquet:
+            self._writer.close()
+        else:
+            self._handle.close()
+
+
+def score_batch(parsed: List[Dict[str, object]], job_skills: List[str], job_embedding: np.ndarray) -> List[Dict[str, object]]:
+    """Embed a batch of parsed resumes and score each against the job."""
+    rows = []
+    ok = [item for item in parsed if "error" not in item]
+    # One model batch for every chunk of every resume (one chunk each when chunking is off)
+    chunk_lists = [embedding_service.chunk_text(item["text"]) for item in ok]
+    chunks = [chunk for item_chunks in chunk_lists for chunk in item_chunks]
+    embeddings = embedding_service.generate_embeddings_batch(chunks) if ok else None
+    if ok and embeddings is None:
+        for item in ok:
+            item["error"] = "embedding failed"
+        ok = []
+    similarities = []
+    start = 0
+    for item_chunks in chunk_lists if ok else []:
+        resume_embedding = embedding_service.combine_chunks(embeddings[start:start + len(item_chunks)])
+        similarities.append(embedding_service.compute_similarity(resume_embedding, job_embedding))
+        start += len(item_chunks)
+    for item, similarity in zip(ok, similarities):
+        gap = SkillGapService.analyze_skill_gap(item["skills"], job_skills)
+        rows.append({
+            "file": item["file"],
+            "status": "ok",
+            "error": None,
+            "match_score": SkillGapService.calculate_match_score(float(similarity), gap["match_percentage"]),
+            "semantic_similarity": round(float(similarity) * 100, 2),
+            "skill_match_percentage": gap["match_percentage"],
+            "skills_matched": gap["skills_matched"],
+            "total_required_skills": gap["total_required_skills"],
+            "missing_skills": ";".join(gap["missing_skills"]),
+            "skills": ";".join(item["skills"]),
+            "text_length": len(item["text"]),
+            "parse_seconds": round(item["parse_seconds"], 4)
+        })
+    for item in parsed:
+        if "error" in item:
+            rows.append({
+                "file": item["file"],
+                "status": "error",
+                "error": item["error"],
+                "parse_seconds": round(item["parse_seconds"], 4)
+            })
+    return rows
+
+
+def summarize(rows_ok: int, rows_failed: int, parse_times: List[float], batch_times: List[float], elapsed: float) -> Dict[str, object]:
+    total = rows_ok + rows_failed
+
+    def percentile(values: List[float], q: float) -> Optional[float]:
+        return round(float(np.percentile(values, q)), 4) if values else None
+
+    return {
+        "files": total,
+        "scored": rows_ok,
+        "failed": rows_failed,
+        "elapsed_seconds": round(elapsed, 3),
+        "files_per_second": round(total / elapsed, 2) if elapsed else 0.0,
+        "parse_seconds": {
+            "p50": percentile(parse_times, 50),
+            "p95": percentile(parse_times, 95),
+            "max": round(max(parse_times), 4) if parse_times else None
+        },
+        "embed_and_score_seconds_per_batch": {
+            "p50": percentile(batch_times, 50),
+            "p95": percentile(batch_times, 95)
+        }
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("folder", help="Folder with PDF/DOCX resumes")
+    job = parser.add_mutually_exclusive_group(required=True)
+    job.add_argument("--job-file", help="Text file with the job description")
+    job.add_argument("--job-description", help="Job description text")
+    parser.add_argument("--job-title", default="Target Role")
+    parser.add_argument("-o", "--output", required=True, help="Output .csv or .parquet file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Parsing processes")
+    parser.add_argument("--batch-size", type=int, default=settings.EMBEDDING_BATCH_MAX_SIZE,
+                        help="Resumes per embedding batch")
+    parser.add_argument("--recursive", action="store_true", help="Include subfolders")
+    parser.add_argument("--summary", help="Also write the summary as JSON")
+    args = parser.parse_args()
+
+    if args.job_file:
+        with open(args.job_file, encoding="utf-8") as f:
+            job_description = f.read()
+    else:
+        job_description = args.job_description
+    job_skills = SkillExtractor.extract_skills(job_description)
+    if not job_skills:
+        job_skills = SkillExtractor.infer_skills_from_role(f"{args.job_title} {job_description}")
+    embedding_service.cache.open_disk()
+    job_embedding = embedding_service.generate_embedding(job_description)
+    if job_embedding is None:
+        raise SystemExit(f"Could not embed the job description: {embedding_service.load_error}")
+
+    started = time.perf_counter()
+    writer = ResultWriter(args.output)
+    parse_times: List[float] = []
+    batch_times: List[float] = []
+    scored = failed = 0
+    pending: List[Dict[str, object]] = []
+
+    def flush() -> None:
+        nonlocal scored, failed
+        batch_started = time.perf_counter()
+        rows = score_batch(pending, job_skills, job_embedding)
+        batch_times.append(time.perf_counter() - batch_started)
+        writer.write(rows)
+        for row in rows:
+            if row["status"] == "ok":
+                scored += 1
+            else:
+                failed += 1
+        pending.clear()
+
+    # Bounded submission keeps memory flat on folders of any size
+    workers = max(1, args.workers)
+    max_in_flight = workers * 4
+    files = find_resumes(args.folder, args.recursive)
+    # Files that were in flight when a worker died (e.g. a crash inside a PDF
+    # library). They are rerun one at a time so only the file that actually
+    # kills a worker is reported as failed.
+    suspects: List[str] = []
+    isolated = set()
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        in_flight = {}
+        exhausted = False
+        while in_flight or suspects or not exhausted:
+            if suspects:
+                if not in_flight:
+                    path = suspects.pop()
+                    isolated.add(path)
+                    in_flight[pool.submit(parse_file, path)] = path
+            else:
+                while not exhausted and len(in_flight) < max_in_flight:
+                    path = next(files, None)
+                    if path is None:
+                        exhausted = True
+                    else:
+                        in_flight[pool.submit(parse_file, path)] = path
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                path = in_flight.pop(future)
+                try:
+                    item = future.result()
+                except BrokenProcessPool as e:
+                    broken = True
+                    if path not in isolated:
+                        suspects.append(path)
+                        continue
+                    item = {"file": path, "error": f"worker crashed: {e}", "parse_seconds": 0.0}
+                except Exception as e:
+                    item = {"file": path, "error": f"{type(e).__name__}: {e}", "parse_seconds": 0.0}
+                parse_times.append(item["parse_seconds"])
+                pending.append(item)
+                if len(pending) >= args.batch_size:
+                    flush()
+            if broken:
+                suspects.extend(in_flight.values())
+                in_flight.clear()
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = ProcessPoolExecutor(max_workers=workers)
+        if pending:
+            flush()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        writer.close()
+
+    summary = summarize(scored, failed, parse_times, batch_times, time.perf_counter() - started)
+    print(json.dumps(summary, indent=2))
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from app.services.skill_extractor import SkillExtractor
+from app.services.skill_matcher import SkillMatcher
+
+
+def reference_skills(text: str) -> set:
+    """Per-alias regex scan that SkillMatcher replaced."""
+    text_lower = text.lower()
+    return {
+        skill
+        for skill, aliases in SkillExtractor.SKILL_DATABASE.items()
+        if any(SkillExtractor._pattern_in_text(alias.lower(), text_lower) for alias in aliases)
+    }
+
+
+ALIASES = sorted({alias for aliases in SkillExtractor.SKILL_DATABASE.values() for alias in aliases})
+SEPARATORS = [" ", ", ", ". ", "/", "-", "(", ")", "\n", "", "_", "+", "#", ".", "x", "1"]
+FILLER = ["experience", "with", "and", "built", "services", "on", "team", "c", "r", "go", "js", "net"]
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "Python, Java and C++ developer",
+    "c# / .net core and asp.net",
+    "next.js, node.js and react.js",
+    "Built REST APIs with FastAPI on AWS; deployed via Docker + Kubernetes",
+    "javascript typescript java",
+    "go-lang golang go",
+    "machine learning, deep-learning and ML ops",
+    "pythonic code, dockerized apps, reactive streams",
+    "C++17 and c++20",
+])
+def test_matches_reference_on_edge_cases(text):
+    assert SkillMatcher(SkillExtractor.SKILL_DATABASE).match(text.lower()) == reference_skills(text)
+
+
+def test_matches_reference_on_random_texts():
+    matcher = SkillMatcher(SkillExtractor.SKILL_DATABASE)
+    rng = random.Random(1234)
+    for _ in range(2000):
+        parts = []
+        for _ in range(rng.randint(1, 30)):
+            token = rng.choice(ALIASES) if rng.random() < 0.6 else rng.choice(FILLER)
+            if rng.random() < 0.3:
+                token = token.upper()
+            parts.append(token)
+            parts.append(rng.choice(SEPARATORS))
+        text = "".join(parts)
+        assert matcher.match(text.lower()) == reference_skills(text), text
+
+
+PREFIX_TAXONOMY = {
+    "node": ["node"],
+    "nodejs": ["node.js"],
+    "rest": ["rest"],
+    "rest_api": ["rest api"],
+    "c": ["c"],
+    "cpp": ["c++"],
+}
+
+
+@pytest.mark.parametrize("text", [
+    "node.js and rest api",
+    "nodes, restful, c++",
+    "node rest c",
+    "node.jsx rest-api c++x",
+])
+def test_prefix_aliases_of_other_skills(text):
+    expected = {
+        skill
+        for skill, aliases in PREFIX_TAXONOMY.items()
+        if any(SkillExtractor._pattern_in_text(alias, text.lower()) for alias in aliases)
+    }
+    assert SkillMatcher(PREFIX_TAXONOMY).match(text.lower()) == expected
+
+
+def test_extract_skills_uses_matcher():
+    text = "Senior Python engineer: FastAPI, PostgreSQL, Docker and AWS."
+    assert SkillExtractor.extract_skills(text) == sorted(reference_skills(text))
+
+
+def test_empty_taxonomy_matches_nothing():
+    assert SkillMatcher({}).match("python java") == set()